@@ -0,0 +1,146 @@
+"""
+Metadata Date Cache Module
+
+Persists the metadata date read from each file, keyed by (path, mtime, size),
+so unchanged files are not parsed again on later runs.
+"""
+
+import os
+import atexit
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# Cache database location (shared by all runs of the tool)
+CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'media_tool', 'exif.db')
+
+# Lookups/inserts waiting to be written, flushed in one transaction
+FLUSH_EVERY = 500
+
+_conn = None
+_disabled = False
+_pending = []
+_lock = threading.Lock()
+
+# path -> (mtime_ns, size, date text), loaded from the database on first lookup
+_rows = None
+
+
+def _connection():
+    """
+    Open the cache database on first use (caller holds _lock).
+
+    Returns:
+        sqlite3.Connection, or None if the cache cannot be used
+    """
+    global _conn, _disabled
+    if _conn is None and not _disabled:
+        try:
+            os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+            conn = sqlite3.connect(CACHE_PATH, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS exif("
+                "path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, dt TEXT)"
+            )
+            _conn = conn
+        except (OSError, sqlite3.Error) as e:
+            logger.warning("Metadata cache unavailable (%s): %s", CACHE_PATH, e)
+            _disabled = True
+    return _conn
+
+
+def _load_rows():
+    """
+    Read the whole table into memory once, so lookups are plain dict reads.
+
+    Returns:
+        dict mapping path to (mtime_ns, size, date text)
+    """
+    global _rows
+    with _lock:
+        if _rows is None:
+            rows = {}
+            conn = _connection()
+            if conn is not None:
+                try:
+                    for path, mtime_ns, size, dt in conn.execute("SELECT path, mtime_ns, size, dt FROM exif"):
+                        rows[path] = (mtime_ns, size, dt)
+                except sqlite3.Error as e:
+                    logger.warning("Could not read metadata cache: %s", e)
+            _rows = rows
+        return _rows
+
+
+def lookup(file_path, stat_result):
+    """
+    Get the cached metadata date of an unchanged file.
+
+    Args:
+        file_path: Path to media file
+        stat_result: os.stat_result of file_path
+
+    Returns:
+        tuple: (found: bool, date: datetime or None). found is False when the
+        file is unknown or changed; date is None when it has no metadata date.
+    """
+    rows = _rows if _rows is not None else _load_rows()
+    entry = rows.get(os.path.abspath(file_path))
+    if entry is None:
+        return (False, None)
+    mtime_ns, size, dt = entry
+    if mtime_ns != stat_result.st_mtime_ns or size != stat_result.st_size:
+        return (False, None)
+    return (True, datetime.fromisoformat(dt) if dt else None)
+
+
+def store(file_path, stat_result, date):
+    """
+    Remember the metadata date of a file (None: it has none).
+
+    Args:
+        file_path: Path to media file
+        stat_result: os.stat_result of file_path
+        date: datetime read from the file's metadata, or None
+    """
+    row = (
+        os.path.abspath(file_path),
+        stat_result.st_mtime_ns,
+        stat_result.st_size,
+        date.isoformat() if date else None
+    )
+    with _lock:
+        if _rows is not None:
+            _rows[row[0]] = row[1:]
+        _pending.append(row)
+        if len(_pending) >= FLUSH_EVERY:
+            _flush_locked()
+
+
+def flush():
+    """Write pending entries to the database."""
+    with _lock:
+        _flush_locked()
+
+
+def _flush_locked():
+    if not _pending:
+        return
+    conn = _connection()
+    batch = _pending[:]
+    _pending.clear()
+    if conn is None:
+        return
+    try:
+        with conn:
+            conn.executemany("INSERT OR REPLACE INTO exif VALUES (?, ?, ?, ?)", batch)
+    except sqlite3.Error as e:
+        logger.warning("Could not update metadata cache: %s", e)
+
+
+# Write what is still pending when the program exits
+atexit.register(flush)
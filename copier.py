@@ -1,97 +1,699 @@
 import os
+import errno
+import stat
 import shutil
+import tempfile
 import logging
-from pathlib import Path
+import threading
+import queue
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from scanner import scan_folder
-from exif_reader import get_media_date, validate_media, is_video_file
-from utils import are_files_identical
+from scanner import scan_folder_batched, find_duplicate_groups
+from exif_reader import probe_media, VIDEO_EXTS
+from utils import file_hash, clear_hash_cache, borrowed_buffer, clear_buffer_pools
+from processed_cache import ProcessedCache
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
 
 logger = logging.getLogger(__name__)
 
+# Bytes requested per in-kernel copy call (the kernel may return fewer)
+KERNEL_COPY_CHUNK = 1 << 30
+
+# errno values meaning "this in-kernel copy method is not available here"
+_KERNEL_COPY_UNSUPPORTED = {
+    errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.ENOTSUP,
+    errno.EOPNOTSUPP, errno.EBADF, errno.ETXTBSY,
+}
+
+# ioctl that clones a whole file as a reflink (Linux: Btrfs, XFS, bcachefs...)
+FICLONE = 0x40049409
+
+# Buffer for the userspace fallback copy
+COPY_BUFFER_SIZE = 4 * 1024 * 1024
+
+# shutil's own buffered path (copy2 on Windows/macOS) defaults to
+# 64 KiB-1 MiB; media files are far larger than that
+shutil.COPY_BUFSIZE = max(shutil.COPY_BUFSIZE, COPY_BUFFER_SIZE)
+
+_SEP = os.sep
+
+# Result of copy_file (a tuple is much cheaper to build than a dict per file)
+CopyResult = namedtuple('CopyResult', 'success dest_path is_duplicate is_identical error')
+
+# A scanned file: full path, file name (split off once) and stat result (or None)
+SourceItem = namedtuple('SourceItem', 'path name stat')
+
+# Result of processing one file on a worker thread
+FileOutcome = namedtuple('FileOutcome', 'status source dest_path is_identical error')
+
+# Default worker threads: the work is mostly disk I/O, so oversubscribe the CPUs
+DEFAULT_MAX_WORKERS = min(32, (os.cpu_count() or 4) * 2)
+
+# Maximum number of scanned paths waiting for a worker
+SCAN_QUEUE_SIZE = 1024
+
+# Files of one directory stat-ed and sorted by inode together (rotational disks)
+SORT_BATCH_SIZE = 1024
+
+# DirEntry.stat() needs no system call on Windows (the directory listing
+# carries it); elsewhere it is a regular stat
+_ENTRY_STAT_IS_FREE = os.name == 'nt'
+
+# st_dev -> whether the device is a spinning disk (inode order then pays off)
+_rotational_devs = {}
+
+# End-of-stream marker for the scan and outcome queues
+_SENTINEL = object()
+
+# Write buffer for the report files
+LOG_BUFFER_SIZE = 1024 * 1024
+
+# Seconds between forwarded progress updates
+PROGRESS_INTERVAL = 0.1
+
+# Progress updates kept between two forwards (older ones are superseded anyway)
+PROGRESS_RING_SIZE = 256
+
+# Destination paths claimed by a worker during the current run.
+# Maps dest_path -> threading.Event that is set once the transfer finished,
+# so two workers never write the same target concurrently.
+_claimed_dests = {}
+_claim_lock = threading.Lock()
+
+# (dest_base, year, month, day) -> formatted date directory path
+_date_dirs = {}
+
+# Date directories already created (or verified) during the current run
+_created_dirs = set()
+_dirs_lock = threading.Lock()
+
+# Per destination directory {size: [paths]} index used for content matching
+_size_index = {}
+_size_lock = threading.Lock()
+
+# (source st_dev, dest_base) pairs on different filesystems: moves between
+# them skip the rename attempt and copy + delete straight away
+_cross_device_moves = set()
+
+# dest_base -> whether its filesystem stores extended attributes (probed once
+# per run; FAT/exFAT cards reject every xattr call copystat would make)
+_xattr_support = {}
+
+
+class _ProgressReporter:
+    """
+    Coalesce progress updates and forward only the latest one at a fixed cadence.
+    
+    Producers call report() as often as they like; updates land in a bounded
+    ring, which a timer thread drains every PROGRESS_INTERVAL seconds before
+    invoking the callback once.
+    """
+    
+    def __init__(self, callback, interval=PROGRESS_INTERVAL):
+        """
+        Args:
+            callback: Function called as callback(current, total, status_msg)
+            interval: Seconds between forwarded updates
+        """
+        self._callback = callback
+        self._interval = interval
+        self._ring = deque(maxlen=PROGRESS_RING_SIZE)
+        self._lock = threading.Lock()
+        self._timer = None
+        self._closed = False
+    
+    def start(self):
+        """Start forwarding updates."""
+        with self._lock:
+            self._schedule()
+    
+    def report(self, current, total, status):
+        """Record a progress update (cheap, never calls the callback directly)."""
+        self._ring.append((current, total, status))
+    
+    def close(self):
+        """Stop the timer and forward the last pending update, if any."""
+        with self._lock:
+            self._closed = True
+            if self._timer:
+                self._timer.cancel()
+            self._flush()
+    
+    def _schedule(self):
+        self._timer = threading.Timer(self._interval, self._tick)
+        self._timer.daemon = True
+        self._timer.start()
+    
+    def _tick(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._flush()
+            self._schedule()
+    
+    def _flush(self):
+        # popleft one at a time so an update appended meanwhile is never dropped
+        latest = None
+        while True:
+            try:
+                latest = self._ring.popleft()
+            except IndexError:
+                break
+        if latest is not None:
+            self._callback(*latest)
+
 
-def copy_file(source_path, dest_base, date, move_files=False, check_binary=False):
+def _fast_copy(source_path, dest_path, source_stat=None, copy_xattrs=True):
+    """
+    Copy file data and metadata like shutil.copy2, keeping the bytes in the kernel.
+    
+    Tries a FICLONE reflink, then os.copy_file_range, then os.sendfile, then a
+    plain buffered copy. Copied pages are dropped from the page cache afterwards.
+    Platforms without copy_file_range use shutil.copy2, which already has its
+    own native fast path there.
+    
+    Args:
+        source_path: Source file path
+        dest_path: Destination file path (must not exist)
+        source_stat: Optional os.stat_result of source_path
+        copy_xattrs: False to copy only mode and times (destination without xattrs)
+    """
+    if not hasattr(os, 'copy_file_range'):
+        shutil.copy2(source_path, dest_path)
+        return
+    
+    with open(source_path, 'rb') as fsrc:
+        fdst = open(dest_path, 'xb')
+        try:
+            with fdst:
+                src_fd = fsrc.fileno()
+                dst_fd = fdst.fileno()
+                os.posix_fadvise(src_fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                if source_stat is None:
+                    source_stat = os.fstat(src_fd)
+                
+                if not _reflink(src_fd, dst_fd):
+                    # Reserve the whole file up front: fewer extents, fewer metadata updates
+                    if source_stat.st_size:
+                        try:
+                            os.posix_fallocate(dst_fd, 0, source_stat.st_size)
+                        except OSError:
+                            pass
+                    
+                    if not _kernel_copy(src_fd, dst_fd):
+                        _copy_buffered(fsrc, fdst)
+                
+                # Bulk imports would otherwise evict everyone else's page cache.
+                # On the destination this also starts writeback early.
+                os.posix_fadvise(src_fd, 0, 0, os.POSIX_FADV_DONTNEED)
+                os.posix_fadvise(dst_fd, 0, 0, os.POSIX_FADV_DONTNEED)
+                
+                if not copy_xattrs:
+                    os.fchmod(dst_fd, stat.S_IMODE(source_stat.st_mode))
+                    os.utime(dst_fd, ns=(source_stat.st_atime_ns, source_stat.st_mtime_ns))
+        except BaseException:
+            # Don't leave a truncated file behind; it would be flagged as a duplicate later
+            try:
+                os.unlink(dest_path)
+            except OSError:
+                pass
+            raise
+    
+    if copy_xattrs:
+        shutil.copystat(source_path, dest_path)
+
+
+def _supports_xattr(dest_base, dest_dir):
+    """
+    Check once per run whether dest_base's filesystem accepts extended attributes.
+    
+    Args:
+        dest_base: Destination base directory (cache key)
+        dest_dir: Existing directory under dest_base to probe in
+        
+    Returns:
+        bool: False if setting a user xattr fails there
+    """
+    supported = _xattr_support.get(dest_base)
+    if supported is None:
+        supported = hasattr(os, 'setxattr')
+        if supported:
+            fd, probe = tempfile.mkstemp(prefix='.xattr-probe-', dir=dest_dir)
+            try:
+                os.setxattr(fd, 'user.media_tool', b'1')
+            except OSError:
+                supported = False
+            finally:
+                os.close(fd)
+                os.unlink(probe)
+        # Racing workers may both probe; they reach the same answer
+        _xattr_support[dest_base] = supported
+    return supported
+
+
+def _copy_buffered(fsrc, fdst):
+    """
+    Copy the rest of fsrc into fdst through a pooled buffer (userspace fallback).
+    
+    Args:
+        fsrc: Source file object opened 'rb'
+        fdst: Destination file object opened for binary writing
+    """
+    with borrowed_buffer(COPY_BUFFER_SIZE) as buf, memoryview(buf) as view:
+        while n := fsrc.readinto(view):
+            fdst.write(view[:n])
+    fdst.flush()
+
+
+def _reflink(src_fd, dst_fd):
+    """
+    Share src_fd's data blocks with dst_fd instead of copying them.
+    
+    Args:
+        src_fd: Source file descriptor
+        dst_fd: Empty destination file descriptor on the same filesystem
+        
+    Returns:
+        bool: True if cloned, False if the filesystem (or OS) cannot reflink
+    """
+    if fcntl is None:
+        return False
+    try:
+        fcntl.ioctl(dst_fd, FICLONE, src_fd)
+        return True
+    except OSError:
+        # EXDEV, EOPNOTSUPP, EINVAL, ENOTTY...: fall back to a real copy
+        return False
+
+
+def _kernel_copy(src_fd, dst_fd):
+    """
+    Copy src_fd to dst_fd with copy_file_range, falling back to sendfile.
+    
+    Args:
+        src_fd: Source file descriptor (positioned at 0)
+        dst_fd: Destination file descriptor (positioned at 0)
+        
+    Returns:
+        bool: True if copied, False if neither method is supported for these files
+    """
+    copied = 0
+    try:
+        while True:
+            sent = os.copy_file_range(src_fd, dst_fd, KERNEL_COPY_CHUNK)
+            if not sent:
+                return True
+            copied += sent
+    except OSError as e:
+        if copied or e.errno not in _KERNEL_COPY_UNSUPPORTED:
+            raise
+    
+    try:
+        while True:
+            sent = os.sendfile(dst_fd, src_fd, copied, KERNEL_COPY_CHUNK)
+            if not sent:
+                return True
+            copied += sent
+    except OSError as e:
+        if copied or e.errno not in _KERNEL_COPY_UNSUPPORTED:
+            raise
+    
+    return False
+
+
+def _date_dir(dest_base, date):
+    """
+    Get {dest_base}/{YYYY}/{MM}/{DD} for a date, formatted once per day.
+    
+    Args:
+        dest_base: Destination base directory
+        date: datetime object for organizing
+        
+    Returns:
+        str: Destination date directory
+    """
+    key = (dest_base, date.year, date.month, date.day)
+    dest_dir = _date_dirs.get(key)
+    if dest_dir is None:
+        dest_dir = _date_dirs[key] = os.path.join(
+            dest_base, f"{date.year:04d}", f"{date.month:02d}", f"{date.day:02d}"
+        )
+    return dest_dir
+
+
+def _ensure_dir(dest_dir):
+    """
+    Create dest_dir once per run; later calls for the same day are free.
+    
+    Args:
+        dest_dir: Directory to create
+    """
+    # Membership tests on a set are atomic, so the common case takes no lock
+    if dest_dir in _created_dirs:
+        return
+    os.makedirs(dest_dir, exist_ok=True)
+    with _dirs_lock:
+        _created_dirs.add(dest_dir)
+
+
+def _lstat_or_none(path):
+    """
+    Return os.lstat(path), or None if nothing exists at path.
+    
+    Args:
+        path: Path to probe
+        
+    Returns:
+        os.stat_result or None
+    """
+    try:
+        return os.lstat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+def _sizes_in_dir(dest_dir):
+    """
+    Get the {size: [paths]} index of a destination directory.
+    
+    The directory is listed once per run; files written afterwards are added
+    by _record_size.
+    
+    Args:
+        dest_dir: Destination date directory
+        
+    Returns:
+        dict mapping file size to a list of paths
+    """
+    with _size_lock:
+        index = _size_index.get(dest_dir)
+        if index is not None:
+            return index
+    
+    index = {}
+    try:
+        with os.scandir(dest_dir) as entries:
+            for entry in entries:
+                if entry.is_file(follow_symlinks=False):
+                    index.setdefault(entry.stat(follow_symlinks=False).st_size, []).append(entry.path)
+    except (FileNotFoundError, NotADirectoryError):
+        pass
+    
+    with _size_lock:
+        return _size_index.setdefault(dest_dir, index)
+
+
+def _record_size(dest_dir, size, dest_path):
+    """Add a newly written file to the size index of its directory."""
+    with _size_lock:
+        index = _size_index.get(dest_dir)
+        if index is not None:
+            index.setdefault(size, []).append(dest_path)
+
+
+def _find_same_content(source_path, source_stat, dest_dir, check_binary=False):
+    """
+    Look for a file with the same content as source_path in dest_dir.
+    
+    Only files of the same size are hashed, so the common case costs a dict
+    lookup.
+    
+    Args:
+        source_path: Source file path
+        source_stat: os.stat_result of source_path
+        dest_dir: Destination date directory
+        check_binary: Confirm the match byte for byte (find_duplicate_groups)
+            instead of trusting equal digests
+        
+    Returns:
+        str: Path of the matching file, or None
+    """
+    index = _sizes_in_dir(dest_dir)
+    with _size_lock:
+        candidates = list(index.get(source_stat.st_size, ()))
+    if not candidates:
+        return None
+    
+    if check_binary:
+        for candidate in candidates:
+            # The directory listing may have caught a file another worker is writing
+            _wait_for_claim(candidate)
+        for group in find_duplicate_groups([source_path] + candidates):
+            if source_path in group:
+                return next(path for path in group if path != source_path)
+        return None
+    
+    source_digest = file_hash(source_path, source_stat)
+    if source_digest is None:
+        return None
+    
+    for candidate in candidates:
+        # The directory listing may have caught a file another worker is writing
+        _wait_for_claim(candidate)
+        if file_hash(candidate) == source_digest:
+            return candidate
+    return None
+
+
+def _wait_for_claim(path):
+    """
+    Wait until a transfer another worker is still writing to path is done.
+    
+    Args:
+        path: Destination path
+        
+    Returns:
+        bool: True if there was an unfinished transfer to wait for
+    """
+    with _claim_lock:
+        pending = _claimed_dests.get(path)
+    if pending is None or pending.is_set():
+        return False
+    pending.wait()
+    return True
+
+
+def _release_claim(dest_path):
+    """Forget a destination claim whose transfer did not happen."""
+    with _claim_lock:
+        _claimed_dests.pop(dest_path, None)
+
+
+def _claim_dest(source_path, source_stat, dest_dir, filename, check_binary):
+    """
+    Pick a free destination name in dest_dir, or detect a duplicate.
+    
+    Args:
+        source_path: Source file path
+        source_stat: os.stat_result of source_path
+        dest_dir: Date directory the file belongs in
+        filename: Base name of the source file
+        check_binary: Whether to confirm same-named duplicates byte for byte
+        
+    Returns:
+        Tuple of (dest_path, done_event, duplicate). When duplicate is a
+        CopyResult nothing was claimed and no transfer is needed; otherwise
+        the caller owns the claim and must set done_event when finished.
+    """
+    stem, ext = os.path.splitext(filename)
+    suffix = 0
+    while True:
+        name = f"{stem}_{suffix}{ext}" if suffix else filename
+        # dest_dir never ends with a separator, so plain concatenation is a join
+        dest_path = dest_dir + _SEP + name
+        
+        # Check if destination already exists (on disk or claimed by another worker).
+        # Claims of finished transfers are kept for the whole run, so stat-ing
+        # outside the lock cannot miss a file another worker just wrote.
+        dest_stat = _lstat_or_none(dest_path)
+        if dest_stat is None:
+            with _claim_lock:
+                pending = _claimed_dests.get(dest_path)
+                if pending is None:
+                    done = _claimed_dests[dest_path] = threading.Event()
+            if pending is None:
+                break
+            # Wait for the other worker, then look at this name again
+            pending.wait()
+            continue
+        
+        # A target still being written has its final size (fallocate) but
+        # not its content yet; compare it once the transfer is done
+        if _wait_for_claim(dest_path):
+            continue
+        
+        if dest_stat.st_size != source_stat.st_size:
+            # Same name but different content: keep both
+            suffix += 1
+            continue
+        
+        # Same name and size: only the same content makes it a duplicate
+        # (fixed-size RAW files and burst shots often share both)
+        source_digest = file_hash(source_path, source_stat)
+        if source_digest is None or source_digest != file_hash(dest_path, dest_stat):
+            suffix += 1
+            continue
+        
+        # Equal digests; "identical" is only claimed after a byte comparison
+        is_identical = None
+        if check_binary:
+            if not find_duplicate_groups((source_path, dest_path)):
+                suffix += 1
+                continue
+            is_identical = True
+        
+        logger.debug("Duplicate found (Identical: %s): %s -> %s", is_identical, source_path, dest_path)
+        return dest_path, None, CopyResult(False, dest_path, True, is_identical, None)
+    
+    # Same photo under another name?
+    try:
+        existing = _find_same_content(source_path, source_stat, dest_dir, check_binary)
+        is_identical = True if check_binary else None
+    except BaseException:
+        _release_claim(dest_path)
+        done.set()
+        raise
+    if existing:
+        logger.debug("Duplicate content found (Identical: %s): %s -> %s", is_identical, source_path, existing)
+        _release_claim(dest_path)
+        done.set()
+        return dest_path, None, CopyResult(False, existing, True, is_identical, None)
+    
+    return dest_path, done, None
+
+
+def _transfer(source_path, source_stat, dest_base, dest_dir, dest_path, move_files):
+    """Move or copy source_path to an already claimed dest_path."""
+    # Create destination directory if needed
+    _ensure_dir(dest_dir)
+    
+    if move_files:
+        # Same filesystem: a single rename, without shutil.move's probing.
+        # Otherwise copy (in-kernel where possible) and delete the source.
+        move_key = (source_stat.st_dev, dest_base)
+        if move_key not in _cross_device_moves:
+            try:
+                os.rename(source_path, dest_path)
+                logger.debug("Moved: %s -> %s", source_path, dest_path)
+                return
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+                # Don't try renaming between these two again this run
+                _cross_device_moves.add(move_key)
+        _fast_copy(source_path, dest_path, source_stat,
+                   _supports_xattr(dest_base, dest_dir))
+        os.unlink(source_path)
+        logger.debug("Moved: %s -> %s", source_path, dest_path)
+    else:
+        # Copy file (preserves metadata)
+        _fast_copy(source_path, dest_path, source_stat,
+                   _supports_xattr(dest_base, dest_dir))
+        logger.debug("Copied: %s -> %s", source_path, dest_path)
+
+
+def copy_file(source_path, dest_base, date, move_files=False, check_binary=False, source_stat=None, filename=None):
     """
     Copy or move media file to destination with date-based structure.
     
+    Duplicates are detected size-first: a same-named file of a different size
+    or content digest is kept under a numbered name (IMG_0001_1.JPG), while a
+    file with the same digest under any name in the date folder is reported
+    as a duplicate. Only check_binary compares the bytes and reports it
+    identical.
+    
     Args:
         source_path: Source file path
         dest_base: Destination base directory
         date: datetime object for organizing
         move_files: Whether to move instead of copy
-        check_binary: Whether to check binary equality for duplicates
+        check_binary: Whether to confirm same-named duplicates byte for byte
+        source_stat: Optional os.stat_result of source_path (avoids a second stat)
+        filename: Optional file name of source_path, if already known
         
     Returns:
-        dict with keys:
-            - 'success': bool
-            - 'dest_path': destination path (if copied or duplicate)
-            - 'is_duplicate': bool
-            - 'is_identical': bool (if binary checked and matched)
-            - 'error': error message (if failed)
+        CopyResult with fields:
+            - success: bool
+            - dest_path: destination path (if copied or duplicate)
+            - is_duplicate: bool
+            - is_identical: True if compared byte for byte and equal, None
+              if only the content digests matched
+            - error: error message (if failed)
     """
     try:
         # Build destination path: {dest_base}/{YYYY}/{MM}/{DD}/{filename}
-        filename = os.path.basename(source_path)
-        year = f"{date.year:04d}"
-        month = f"{date.month:02d}"
-        day = f"{date.day:02d}"
+        if filename is None:
+            filename = os.path.basename(source_path)
+        dest_dir = _date_dir(dest_base, date)
+        if source_stat is None:
+            source_stat = os.stat(source_path)
         
-        dest_dir = os.path.join(dest_base, year, month, day)
-        dest_path = os.path.join(dest_dir, filename)
+        # Slow path: name collisions, pending claims and content duplicates
+        dest_path, done, duplicate = _claim_dest(
+            source_path, source_stat, dest_dir, filename, check_binary
+        )
+        if duplicate is not None:
+            return duplicate
         
-        # Check if destination already exists
-        if os.path.exists(dest_path):
-            is_identical = False
-            if check_binary:
-                is_identical = are_files_identical(source_path, dest_path)
-                logger.debug(f"Duplicate found (Identical: {is_identical}): {source_path} -> {dest_path}")
-            else:
-                logger.debug(f"Duplicate found: {source_path} -> {dest_path}")
-                
-            return {
-                'success': False,
-                'dest_path': dest_path,
-                'is_duplicate': True,
-                'is_identical': is_identical,
-                'error': None
-            }
-        
-        # Create destination directory if needed
-        os.makedirs(dest_dir, exist_ok=True)
-        
-        if move_files:
-            # Move file
-            shutil.move(source_path, dest_path)
-            logger.debug(f"Moved: {source_path} -> {dest_path}")
-        else:
-            # Copy file (preserves metadata)
-            shutil.copy2(source_path, dest_path)
-            logger.debug(f"Copied: {source_path} -> {dest_path}")
+        try:
+            _transfer(source_path, source_stat, dest_base, dest_dir, dest_path, move_files)
+            _record_size(dest_dir, source_stat.st_size, dest_path)
+        except BaseException:
+            # Release the claim so later files are not flagged against a missing target
+            _release_claim(dest_path)
+            raise
+        finally:
+            done.set()
         
-        return {
-            'success': True,
-            'dest_path': dest_path,
-            'is_duplicate': False,
-            'is_identical': False,
-            'error': None
-        }
+        return CopyResult(True, dest_path, False, False, None)
         
     except PermissionError as e:
-        logger.error(f"Permission denied copying {source_path}: {e}")
-        return {
-            'success': False,
-            'dest_path': None,
-            'is_duplicate': False,
-            'error': f"Permission denied: {e}"
-        }
+        logger.error("Permission denied copying %s: %s", source_path, e)
+        return CopyResult(False, None, False, False, f"Permission denied: {e}")
     except Exception as e:
-        logger.error(f"Error copying {source_path}: {e}")
-        return {
-            'success': False,
-            'dest_path': None,
-            'is_duplicate': False,
-            'error': str(e)
-        }
+        logger.error("Error copying %s: %s", source_path, e)
+        return CopyResult(False, None, False, False, str(e))
+
+
+def _write_report(log_dir, log_filename, title, total_line, records):
+    """
+    Write a report file with a header and one pre-formatted entry per record.
+    
+    The whole report is joined in memory and written with a single call.
+    
+    Args:
+        log_dir: Directory to save the report in
+        log_filename: Report file name
+        title: Title line (the generation time is appended)
+        total_line: Summary line shown under the title
+        records: Iterable of formatted record strings
+        
+    Returns:
+        str: Path to the created report
+    """
+    # Create logs directory if it doesn't exist (should be passed in)
+    os.makedirs(log_dir, exist_ok=True)
+    
+    # Filename inside the session folder
+    log_path = os.path.join(log_dir, log_filename)
+    
+    lines = [
+        f"{title} - Generated {datetime.now()}",
+        '=' * 80,
+        '',
+        total_line,
+        '',
+    ]
+    lines.extend(records)
+    
+    with open(log_path, 'w', encoding='utf-8', buffering=LOG_BUFFER_SIZE) as f:
+        f.write('\n'.join(lines) + '\n')
+    return log_path
 
 
 def _write_invalid_images_log(invalid_files, log_dir):
@@ -106,28 +708,18 @@ def _write_invalid_images_log(invalid_files, log_dir):
         str: Path to the created log file
     """
     try:
-        # Create logs directory if it doesn't exist (should be passed in)
-        os.makedirs(log_dir, exist_ok=True)
-        
-        # Filename inside the session folder
-        log_filename = "invalid_files.log"
-        log_path = os.path.join(log_dir, log_filename)
-        
-        with open(log_path, 'w', encoding='utf-8') as f:
-            f.write(f"Invalid Images Log - Generated {datetime.now()}\n")
-            f.write(f"{'='*80}\n\n")
-            f.write(f"Total invalid images: {len(invalid_images)}\n\n")
-            
-            for item in invalid_images:
-                f.write(f"File: {item['source']}\n")
-                f.write(f"Error: {item['error']}\n")
-                f.write(f"{'-'*80}\n")
-        
-        logger.info(f"Invalid images log saved to: {log_path}")
+        log_path = _write_report(
+            log_dir,
+            "invalid_files.log",
+            "Invalid Images Log",
+            f"Total invalid images: {len(invalid_files)}",
+            (f"File: {item['source']}\nError: {item['error']}\n{'-' * 80}" for item in invalid_files)
+        )
+        logger.info("Invalid images log saved to: %s", log_path)
         return log_path
         
     except Exception as e:
-        logger.error(f"Error writing invalid images log: {e}")
+        logger.error("Error writing invalid images log: %s", e)
         return None
 
 
@@ -143,43 +735,260 @@ def _write_success_log(success_files, log_dir):
         str: Path to the created log file
     """
     try:
-        # Create logs directory if it doesn't exist
-        os.makedirs(log_dir, exist_ok=True)
-        
-        # Filename inside session folder
-        log_filename = "success_report.txt"
-        log_path = os.path.join(log_dir, log_filename)
-        
-        with open(log_path, 'w', encoding='utf-8') as f:
-            f.write(f"Success Report - Generated {datetime.now()}\n")
-            f.write(f"{'='*80}\n\n")
-            f.write(f"Total files copied successfully: {len(success_files)}\n\n")
-            
-            for item in success_files:
-                f.write(f"{item['source']}  -->  {item['destination']}\n")
-        
-        logger.info(f"Success report saved to: {log_path}")
+        log_path = _write_report(
+            log_dir,
+            "success_report.txt",
+            "Success Report",
+            f"Total files copied successfully: {len(success_files)}",
+            (f"{item['source']}  -->  {item['destination']}" for item in success_files)
+        )
+        logger.info("Success report saved to: %s", log_path)
         return log_path
         
     except Exception as e:
-        logger.error(f"Error writing success report: {e}")
+        logger.error("Error writing success report: %s", e)
         return None
 
 
+def _process_one(source_path, dest_folder, move_files, check_binary, source_stat=None, cache=None, filename=None, deep_validate=False):
+    """
+    Validate, date and copy/move a single media file.
+    
+    Runs on a worker thread, so it only returns an outcome and never touches
+    the shared counters or the progress callback.
+    
+    Args:
+        source_path: Source file path
+        dest_folder: Destination base directory
+        move_files: Whether to move instead of copy
+        check_binary: Whether to check binary equality for duplicates
+        source_stat: Optional os.stat_result already taken by the scanner
+        cache: Optional ProcessedCache of files organized by earlier runs
+        filename: Optional file name of source_path, if already known
+        deep_validate: Verify image data instead of checking signatures only
+        
+    Returns:
+        FileOutcome with fields:
+            - status: one of 'success', 'duplicate', 'processed' (copied by an
+              earlier run), 'invalid', 'no_date', 'error'
+            - source: source file path
+            - dest_path: destination path (success/duplicate)
+            - is_identical: True/None as in CopyResult (duplicate only)
+            - error: error message (invalid/no_date/error)
+    """
+    try:
+        return _organize_file(source_path, dest_folder, move_files, check_binary, source_stat, cache, filename, deep_validate)
+    except Exception as e:
+        # One unreadable file (PIL, piexif, ffprobe output) must not abort the
+        # run and lose the outcomes collected so far
+        logger.error("Unexpected error processing %s: %s", source_path, e, exc_info=True)
+        return FileOutcome('error', source_path, None, False, str(e))
+
+
+def _organize_file(source_path, dest_folder, move_files, check_binary, source_stat, cache, filename, deep_validate):
+    """Body of _process_one (same arguments and result; may raise)."""
+    # One stat per file, shared by the date fallback and duplicate check
+    if source_stat is None:
+        try:
+            source_stat = os.stat(source_path)
+        except OSError as e:
+            logger.error("Cannot access %s: %s", source_path, e)
+            return FileOutcome('error', source_path, None, False, str(e))
+    
+    # Unchanged file that an earlier run copied to done_path (still there with
+    # the same size): reported as a duplicate of its own copy, flagged so the
+    # review tells it apart; no metadata is read and nothing is compared
+    if cache is not None:
+        done_path = cache.lookup(source_path, source_stat)
+        if done_path is not None:
+            done_stat = _lstat_or_none(done_path)
+            if done_stat is not None and done_stat.st_size == source_stat.st_size:
+                logger.debug("Already processed: %s -> %s", source_path, done_path)
+                return FileOutcome('processed', source_path, done_path, None, None)
+    
+    # Validate media file and extract its date (one open for images)
+    is_valid, date, error_msg = probe_media(source_path, stat_result=source_stat, deep=deep_validate)
+    
+    if not is_valid:
+        logger.warning("Invalid file, skipping: %s", source_path)
+        return FileOutcome('invalid', source_path, None, False, error_msg)
+    
+    if not date:
+        logger.warning("Could not extract date from: %s", source_path)
+        return FileOutcome('no_date', source_path, None, False, 'Could not extract date')
+    
+    # Process file (copy or move)
+    result = copy_file(
+        source_path, 
+        dest_folder, 
+        date, 
+        move_files=move_files,
+        check_binary=check_binary,
+        source_stat=source_stat,
+        filename=filename
+    )
+    
+    if result.success:
+        if cache is not None:
+            cache.record(source_path, source_stat, result.dest_path)
+        return FileOutcome('success', source_path, result.dest_path, False, None)
+    elif result.is_duplicate:
+        return FileOutcome('duplicate', source_path, result.dest_path, result.is_identical, None)
+    else:
+        return FileOutcome('error', source_path, None, False, result.error)
+
+
+def _scanned_name(source_path):
+    """
+    Get the file name of a path produced by scan_folder.
+    
+    scan_folder always joins the name with os.sep, so a single rpartition is
+    enough; os.path.basename would also scan for '/' on Windows.
+    
+    Args:
+        source_path: Path yielded by scan_folder
+        
+    Returns:
+        str: File name
+    """
+    return source_path.rpartition(_SEP)[2]
+
+
+def _is_rotational(st_dev):
+    """
+    Check whether st_dev is a spinning disk, so reading in inode order helps.
+    
+    Devices that cannot be identified (network shares, non-Linux systems)
+    count as rotational; sorting one directory's files is cheap either way.
+    
+    Args:
+        st_dev: Device number from os.stat
+        
+    Returns:
+        bool: False only for block devices the kernel reports as non-rotational
+    """
+    rotational = _rotational_devs.get(st_dev)
+    if rotational is None:
+        rotational = True
+        if hasattr(os, 'major'):
+            block = f"/sys/dev/block/{os.major(st_dev)}:{os.minor(st_dev)}"
+            # Partitions keep the queue settings on their parent disk
+            for flag in (block + "/queue/rotational", block + "/../queue/rotational"):
+                try:
+                    with open(flag) as f:
+                        rotational = f.read().strip() != '0'
+                    break
+                except OSError:
+                    continue
+        _rotational_devs[st_dev] = rotational
+    return rotational
+
+
+def _queue_batch(batch, paths):
+    """
+    Queue one directory's paths, in inode order when the disk is rotational.
+    
+    Args:
+        batch: List of os.DirEntry from the same directory
+        paths: queue.Queue of SourceItem
+    """
+    if _ENTRY_STAT_IS_FREE:
+        # Windows: the listing already holds the stat; inode numbers are 0
+        for entry in batch:
+            try:
+                paths.put(SourceItem(entry.path, entry.name, entry.stat()))
+            except OSError:
+                paths.put(SourceItem(entry.path, entry.name, None))
+        return
+    
+    try:
+        first_stat = batch[0].stat()
+    except OSError:
+        first_stat = None
+    
+    if first_stat is None or not _is_rotational(first_stat.st_dev):
+        # Workers stat these in parallel themselves
+        for entry in batch:
+            paths.put(SourceItem(entry.path, entry.name, None))
+        return
+    
+    items = [SourceItem(batch[0].path, batch[0].name, first_stat)]
+    for entry in batch[1:]:
+        try:
+            items.append(SourceItem(entry.path, entry.name, entry.stat()))
+        except OSError:
+            # Let the worker hit (and report) the error
+            items.append(SourceItem(entry.path, entry.name, None))
+    # Inode order approximates on-disk order, keeping readahead useful
+    items.sort(key=lambda item: item.stat.st_ino if item.stat is not None else 0)
+    for item in items:
+        paths.put(item)
+
 
+def _scan_producer(source_folder, paths, worker_count, scan):
+    """
+    Feed scanned paths into the bounded work queue, then one sentinel per worker.
+    
+    Args:
+        source_folder: Source directory to scan
+        paths: queue.Queue of SourceItem consumed by the workers
+        worker_count: Number of workers to stop once the scan is done
+        scan: dict whose 'total' is set to the number of files found
+    """
+    count = 0
+    try:
+        # Each batch holds files of a single directory
+        for batch in scan_folder_batched(source_folder, batch_size=SORT_BATCH_SIZE, entries=True):
+            _queue_batch(batch, paths)
+            count += len(batch)
+    finally:
+        scan['total'] = count
+        logger.info("Found %s media files to process", count)
+        for _ in range(worker_count):
+            paths.put(_SENTINEL)
+
+
+def _process_worker(paths, outcomes, dest_folder, move_files, check_binary, cache, deep_validate):
+    """
+    Worker loop: process queued paths until the sentinel arrives.
+    
+    Args:
+        paths: queue.Queue of SourceItem
+        outcomes: queue.Queue receiving _process_one results, then a sentinel
+        dest_folder: Destination base directory
+        move_files: Whether to move instead of copy
+        check_binary: Whether to check binary equality for duplicates
+        cache: ProcessedCache to consult and update, or None
+        deep_validate: Verify image data instead of checking signatures only
+    """
+    try:
+        while (item := paths.get()) is not _SENTINEL:
+            outcomes.put(_process_one(
+                item.path, dest_folder, move_files, check_binary, item.stat, cache, item.name, deep_validate
+            ))
+    finally:
+        outcomes.put(_SENTINEL)
 
-def process_media(source_folder, dest_folder, move_files=False, delete_duplicates=False, log_dir=None, progress_callback=None):
+
+def process_media(source_folder, dest_folder, move_files=False, delete_duplicates=False, log_dir=None, progress_callback=None, max_workers=None, deep_validate=False):
     """
     Process all media files (images and videos) from source to destination.
     
+    Files are validated, dated and copied on a pool of worker threads; results
+    are aggregated (and progress reported) on the calling thread.
+    
     Args:
         source_folder: Source directory to scan
         dest_folder: Destination base directory
         move_files: Whether to move instead of copy
         delete_duplicates: Whether to check and flag duplicates for deletion (strict check)
         log_dir: Directory to save logs/reports
-        progress_callback: Function to call with progress updates
-                          Signature: callback(current, total, status_msg)
+        progress_callback: Function to call with progress updates.
+                          Signature: callback(current, total, status_msg);
+                          total is None while still scanning
+        max_workers: Number of worker threads (default: DEFAULT_MAX_WORKERS)
+        deep_validate: Fully decode-check images with PIL (slow); by default
+            only their file signature is checked
         
     Returns:
         dict with keys:
@@ -196,7 +1005,7 @@ def process_media(source_folder, dest_folder, move_files=False, delete_duplicate
             - 'invalid_log_path': path to invalid files log
             - 'success_log_path': path to success report
     """
-    logger.info(f"Processing media from {source_folder} to {dest_folder} (Move: {move_files}, Delete Dups: {delete_duplicates})")
+    logger.info("Processing media from %s to %s (Move: %s, Delete Dups: %s)", source_folder, dest_folder, move_files, delete_duplicates)
     
     success_count = 0
     image_count = 0
@@ -209,95 +1018,143 @@ def process_media(source_folder, dest_folder, move_files=False, delete_duplicate
     invalid_files = []
     success_files = []
     
-    # Get all media files
-    media_files = list(scan_folder(source_folder))
-    total_files = len(media_files)
+    # Claims and directory memo only hold for a single run
+    with _claim_lock:
+        _claimed_dests.clear()
+    with _dirs_lock:
+        _created_dirs.clear()
+    _date_dirs.clear()
+    _xattr_support.clear()
+    _cross_device_moves.clear()
+    with _size_lock:
+        _size_index.clear()
+    clear_hash_cache()
     
-    logger.info(f"Found {total_files} media files to process")
+    if max_workers is None:
+        max_workers = DEFAULT_MAX_WORKERS
+    
+    # Stream paths from the scanner into a bounded queue so copying starts
+    # right away and memory stays flat however large the tree is
+    paths = queue.Queue(maxsize=SCAN_QUEUE_SIZE)
+    outcomes = queue.Queue()
+    scan = {'total': None}
+    scanner_thread = threading.Thread(
+        target=_scan_producer,
+        args=(source_folder, paths, max_workers, scan),
+        daemon=True
+    )
+    scanner_thread.start()
+    
+    logger.info("Scanning and processing with %s workers", max_workers)
+    
+    # Resume support for plain copies. Binary checks must really compare the
+    # files, and moved sources are gone, so those runs go without the cache.
+    cache = None
+    if not move_files and not delete_duplicates:
+        cache = ProcessedCache(dest_folder)
     
     if progress_callback:
-        progress_callback(0, total_files, "Starting processing...")
+        progress_callback(0, None, "Starting processing...")
+        reporter = _ProgressReporter(progress_callback)
+        reporter.start()
+    else:
+        reporter = None
     
-    for idx, source_path in enumerate(media_files, 1):
-        try:
-            # Validate media file first
-            is_valid, error_msg = validate_media(source_path)
-            
-            if not is_valid:
-                logger.warning(f"Invalid file, skipping: {source_path}")
-                if progress_callback:
-                    progress_callback(idx, total_files, f"Skipped (invalid): {os.path.basename(source_path)}")
-                invalid_count += 1
-                invalid_files.append({
-                    'source': source_path,
-                    'error': error_msg
-                })
-                continue
-            
-            # Extract date from media
-            date = get_media_date(source_path)
-            
-            if not date:
-                logger.warning(f"Could not extract date from: {source_path}")
-                if progress_callback:
-                    progress_callback(idx, total_files, f"Skipped (no date): {os.path.basename(source_path)}")
-                error_count += 1
-                errors.append({
-                    'source': source_path,
-                    'error': 'Could not extract date'
-                })
-                continue
-            
-            # Process file (copy or move)
-            result = copy_file(
-                source_path, 
-                dest_folder, 
-                date, 
-                move_files=move_files,
-                check_binary=delete_duplicates
-            )
+    idx = 0
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            workers = [
+                executor.submit(_process_worker, paths, outcomes, dest_folder, move_files, delete_duplicates, cache, deep_validate)
+                for _ in range(max_workers)
+            ]
             
-            if result['success']:
-                success_count += 1
-                # Track image vs video count
-                if is_video_file(source_path):
-                    video_count += 1
+            finished_workers = 0
+            while finished_workers < max_workers:
+                outcome = outcomes.get()
+                if outcome is _SENTINEL:
+                    finished_workers += 1
+                    continue
+                
+                idx += 1
+                # Total is unknown (None) until the scanner has finished
+                total_files = scan['total']
+                source_path = outcome.source
+                status = outcome.status
+                status_msg = None
+                
+                if status == 'success':
+                    success_count += 1
+                    # Track image vs video count
+                    if source_path[source_path.rfind('.'):].lower() in VIDEO_EXTS:
+                        video_count += 1
+                    else:
+                        image_count += 1
+                    success_files.append({
+                        'source': source_path,
+                        'destination': outcome.dest_path
+                    })
+                elif status == 'duplicate':
+                    duplicate_count += 1
+                    status_msg = f"Duplicate found: {_scanned_name(source_path)}"
+                    duplicates.append({
+                        'source': source_path,
+                        'existing': outcome.dest_path,
+                        'is_identical': outcome.is_identical
+                    })
+                elif status == 'processed':
+                    duplicate_count += 1
+                    status_msg = f"Already organized: {_scanned_name(source_path)}"
+                    duplicates.append({
+                        'source': source_path,
+                        'existing': outcome.dest_path,
+                        'is_identical': None,
+                        'already_processed': True
+                    })
+                elif status == 'invalid':
+                    status_msg = f"Skipped (invalid): {_scanned_name(source_path)}"
+                    invalid_count += 1
+                    invalid_files.append({
+                        'source': source_path,
+                        'error': outcome.error
+                    })
+                elif status == 'no_date':
+                    status_msg = f"Skipped (no date): {_scanned_name(source_path)}"
+                    error_count += 1
+                    errors.append({
+                        'source': source_path,
+                        'error': outcome.error
+                    })
                 else:
-                    image_count += 1
-                success_files.append({
-                    'source': source_path,
-                    'destination': result['dest_path']
-                })
-            elif result['is_duplicate']:
-                duplicate_count += 1
-                if progress_callback:
-                    progress_callback(idx, total_files, f"Duplicate found: {os.path.basename(source_path)}")
-                duplicates.append({
-                    'source': source_path,
-                    'existing': result['dest_path'],
-                    'is_identical': result.get('is_identical', False)
-                })
-            else:
-                error_count += 1
-                if progress_callback:
-                    progress_callback(idx, total_files, f"Error: {result['error']} - {os.path.basename(source_path)}")
-                errors.append({
-                    'source': source_path,
-                    'error': result['error']
-                })
-            
-            # Update progress (batch updates every 10 files for performance, but show filename)
-            if progress_callback and (idx % 10 == 0 or idx == total_files):
-                status = f"Processed {idx}/{total_files} files..."
-                progress_callback(idx, total_files, status)
+                    error_count += 1
+                    status_msg = f"Error: {outcome.error} - {_scanned_name(source_path)}"
+                    errors.append({
+                        'source': source_path,
+                        'error': outcome.error
+                    })
                 
-        except Exception as e:
-            logger.error(f"Unexpected error processing {source_path}: {e}")
-            error_count += 1
-            errors.append({
-                'source': source_path,
-                'error': str(e)
-            })
+                if cache:
+                    cache.flush()
+                
+                # Only the latest update per interval reaches the callback
+                if reporter:
+                    progress = f"{idx}/{total_files}" if total_files else f"{idx}"
+                    reporter.report(idx, total_files, status_msg or f"Processed {progress} files...")
+            
+            # Surface unexpected worker failures
+            for worker in workers:
+                worker.result()
+        
+        scanner_thread.join()
+        total_files = scan['total']
+        if reporter:
+            reporter.report(total_files, total_files, f"Processed {total_files}/{total_files} files...")
+    finally:
+        if reporter:
+            reporter.close()
+        if cache:
+            cache.close()
+        # Idle read/copy buffers (a few per worker) are not needed between runs
+        clear_buffer_pools()
     
     # Write invalid files log if any
     invalid_log_path = None
@@ -309,7 +1166,7 @@ def process_media(source_folder, dest_folder, move_files=False, delete_duplicate
     if success_files and log_dir:
         success_log_path = _write_success_log(success_files, log_dir)
     
-    logger.info(f"Processing complete. Success: {success_count} (Images: {image_count}, Videos: {video_count}), Duplicates: {duplicate_count}, Invalid: {invalid_count}, Errors: {error_count}")
+    logger.info("Processing complete. Success: %s (Images: %s, Videos: %s), Duplicates: %s, Invalid: %s, Errors: %s", success_count, image_count, video_count, duplicate_count, invalid_count, error_count)
     
     return {
         'success_count': success_count,
@@ -325,4 +1182,3 @@ def process_media(source_folder, dest_folder, move_files=False, delete_duplicate
         'invalid_log_path': invalid_log_path,
         'success_log_path': success_log_path
     }
-
@@ -6,6 +6,7 @@ from PIL import Image
 from PIL.ExifTags import TAGS
 import piexif
 from datetime import datetime, timedelta
+import io
 import os
 
 def create_test_images():
@@ -26,10 +27,13 @@ def create_test_images():
         ("2025-06-01 12:00:00", "image_2025_06_01.jpg"),
     ]
     
+    # Encode the (identical) pixel data once; each file only gets its own EXIF segment
+    img = Image.new('RGB', (800, 600), color=(73, 109, 137))
+    buffer = io.BytesIO()
+    img.save(buffer, "JPEG")
+    jpeg_template = buffer.getvalue()
+    
     for date_str, filename in test_dates:
-        # Create a simple colored image
-        img = Image.new('RGB', (800, 600), color=(73, 109, 137))
-        
         # Parse date
         dt = datetime.strptime(date_str, "%Y-%m-%d %H:%M:%S")
         
@@ -46,7 +50,10 @@ def create_test_images():
         
         # Save with EXIF
         filepath = os.path.join(test_dir, filename)
-        img.save(filepath, "JPEG", exif=exif_bytes)
+        output = io.BytesIO()
+        piexif.insert(exif_bytes, jpeg_template, output)
+        with open(filepath, 'wb') as f:
+            f.write(output.getvalue())
         print(f"  Created: {filename} with date {date_str}")
     
     # Create image without EXIF (will use file modified time)
@@ -10,10 +10,63 @@ from tkinter import ttk, messagebox
 from PIL import Image, ImageTk
 import logging
 import threading
+import queue
+from collections import OrderedDict
 from send2trash import send2trash
+from exif_reader import is_video_file
+
+# Optional: libvips shrinks JPEGs on load and streams pixels, so large photos
+# preview much faster. Falls back to PIL when not installed.
+try:
+    import pyvips
+except (ImportError, OSError):  # OSError: binding present but libvips missing
+    pyvips = None
 
 logger = logging.getLogger(__name__)
 
+# Preview thumbnails are fitted into this box
+PREVIEW_SIZE = (400, 400)
+
+# Decoded thumbnails kept across review windows (LRU)
+THUMB_CACHE_SIZE = 64
+
+# Tk PhotoImages kept per review window, so going back to a pair is instant
+PHOTO_CACHE_SIZE = 32
+
+# Rows of the duplicate list rendered at a time (the list is virtual)
+LIST_ROWS = 6
+
+# (path, mtime_ns) -> PIL thumbnail, most recent last. Plain images rather than
+# PhotoImages, so any thread (and any later review window) can use them.
+_thumb_cache = OrderedDict()
+_thumb_lock = threading.Lock()
+
+
+def _vips_thumbnail(image_path):
+    """
+    Make a preview thumbnail with libvips.
+    
+    Args:
+        image_path: Path to image file
+        
+    Returns:
+        PIL image fitted into PREVIEW_SIZE, or None if libvips cannot make one
+    """
+    try:
+        vi = pyvips.Image.thumbnail(image_path, PREVIEW_SIZE[0], height=PREVIEW_SIZE[1], size='down')
+        vi = vi.colourspace('srgb')
+        if vi.format != 'uchar':
+            vi = vi.cast('uchar')
+        mode = 'RGBA' if vi.bands == 4 else 'RGB'
+        if vi.bands not in (3, 4):
+            vi = vi.extract_band(0, n=3)
+        # Only a PIL image is handed over; the PhotoImage is made on the Tk thread
+        return Image.frombytes(mode, (vi.width, vi.height), vi.write_to_memory())
+    except Exception as e:
+        # Unreadable file or unexpected band layout: PIL gets to try instead
+        logger.debug("libvips could not preview %s: %s", image_path, e)
+        return None
+
 
 class DuplicateReviewWindow:
     """Window for manually reviewing and handling duplicate files."""
@@ -28,10 +81,12 @@ class DuplicateReviewWindow:
             progress_callback: Optional callback for progress updates
         """
         self.parent = parent
-        self.duplicates = duplicates.copy()  # Work with a copy
+        self.duplicates = duplicates  # Never mutated in place; deletions rebind it
         self.progress_callback = progress_callback
         self.current_index = 0
-        self.marked_indices = set()
+        self.marked_paths = set()  # source paths marked for deletion
+        self.visible_start = 0  # first duplicate shown in the list
+        self._names = {}  # source path -> list label, filled as rows are shown
         
         # Create window
         self.window = tk.Toplevel(parent)
@@ -45,10 +100,23 @@ class DuplicateReviewWindow:
         self.mark_delete_var = tk.BooleanVar(value=False)
         self.load_counter = 0
         
+        # Decoding runs on one worker into the shared thumbnail cache;
+        # PhotoImages are made on the Tk thread.
+        # slot ('source'/'existing') -> latest preview request; a newer request
+        # replaces an older one that has not started yet
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        self._preview_queue = queue.Queue()
+        self._closed = False
+        threading.Thread(target=self._preview_worker, daemon=True).start()
+        # (path, mtime_ns) -> ImageTk.PhotoImage; only touched on the Tk thread
+        self._photo_cache = OrderedDict()
+        self.window.bind('<Destroy>', self._on_destroy)
+        
         # Auto-mark identical files
-        for i, dup in enumerate(self.duplicates):
+        for dup in self.duplicates:
             if dup.get('is_identical', False):
-                self.marked_indices.add(i)
+                self.marked_paths.add(dup['source'])
         
         self._build_ui()
         self._load_current_duplicate()
@@ -59,17 +127,20 @@ class DuplicateReviewWindow:
         list_frame = ttk.LabelFrame(self.window, text="Duplicate Files", padding=10)
         list_frame.pack(fill=tk.BOTH, expand=False, padx=10, pady=5)
         
-        # Listbox with scrollbar
-        list_scroll = ttk.Scrollbar(list_frame)
-        list_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        # Listbox with scrollbar. Only LIST_ROWS rows exist in Tk; the
+        # scrollbar drives which slice of self.duplicates they show.
+        self.list_scroll = ttk.Scrollbar(list_frame, command=self._on_scroll)
+        self.list_scroll.pack(side=tk.RIGHT, fill=tk.Y)
         
         self.duplicate_list = tk.Listbox(
             list_frame,
-            height=6,
-            yscrollcommand=list_scroll.set
+            height=LIST_ROWS,
+            exportselection=False
         )
         self.duplicate_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        list_scroll.config(command=self.duplicate_list.yview)
+        self.duplicate_list.bind('<MouseWheel>', self._on_mouse_wheel)
+        self.duplicate_list.bind('<Button-4>', self._on_mouse_wheel)
+        self.duplicate_list.bind('<Button-5>', self._on_mouse_wheel)
         
         
         # Controls Frame (Prev, Next, Mark) - inside list_frame
@@ -123,16 +194,7 @@ class DuplicateReviewWindow:
         self.mark_check.pack(side=tk.LEFT, padx=5)
         
         # 1. Populate list (Takes remaining space)
-        for i, dup in enumerate(self.duplicates):
-            name = os.path.basename(dup['source'])
-            self.duplicate_list.insert(tk.END, name)
-            
-            # Apply formatting for marked items immediately
-            if i in self.marked_indices:
-                self.duplicate_list.itemconfig(i, foreground='red')
-                self.duplicate_list.delete(i) # Replace with marked text
-                self.duplicate_list.insert(i, f"[DEL] {name}")
-                self.duplicate_list.itemconfig(i, foreground='red')
+        self._repopulate_visible()
         
         # Update button state initially
         self._update_process_btn()
@@ -190,9 +252,23 @@ class DuplicateReviewWindow:
         self.duplicate_list.bind('x', lambda e: self._on_mark_toggle())
         self.duplicate_list.bind('X', lambda e: self._on_mark_toggle())
         self.duplicate_list.bind('<space>', lambda e: self._on_mark_toggle())
+        
+        # The Listbox only holds the visible rows, so its own cursor keys
+        # would stop at the window edge; move through the full list instead
+        self.duplicate_list.bind('<Up>', lambda e: self._on_list_key(-1))
+        self.duplicate_list.bind('<Down>', lambda e: self._on_list_key(1))
+        self.duplicate_list.bind('<Prior>', lambda e: self._on_list_key(-LIST_ROWS))
+        self.duplicate_list.bind('<Next>', lambda e: self._on_list_key(LIST_ROWS))
+        self.duplicate_list.bind('<Home>', lambda e: self._on_list_key(-len(self.duplicates)))
+        self.duplicate_list.bind('<End>', lambda e: self._on_list_key(len(self.duplicates)))
 
-        # Set focus to capture keys
-        self.window.after(100, lambda: self.window.focus_force())
+        # Set focus to capture keys once the window is shown (children's
+        # <Map> events reach this binding too, so filter on the window)
+        self.window.bind(
+            '<Map>',
+            lambda e: self.window.focus_set() if e.widget is self.window else None,
+            add='+'
+        )
     
     def _load_current_duplicate(self):
         """Load and display current duplicate pair."""
@@ -203,60 +279,129 @@ class DuplicateReviewWindow:
         dup = self.duplicates[self.current_index]
         
         # Select in listbox
+        self._ensure_visible(self.current_index)
         self.duplicate_list.selection_clear(0, tk.END)
-        self.duplicate_list.selection_set(self.current_index)
-        self.duplicate_list.see(self.current_index)
+        self.duplicate_list.selection_set(self.current_index - self.visible_start)
         
         # Load images
         self._load_image_preview(dup['source'], self.source_label, self.source_path_label, is_source=True)
         self._load_image_preview(dup['existing'], self.existing_label, self.existing_path_label, is_source=False)
+        self._prefetch_neighbours()
         
         # Show binary match status
         is_identical = dup.get('is_identical')
-        if is_identical is True:
+        if dup.get('already_processed'):
+            self.match_label.config(text="ℹ️ Copied here by an earlier run (source unchanged since)", foreground="blue")
+        elif is_identical is True:
             self.match_label.config(text="✅ Binary Match: YES (Files are identical)", foreground="green")
         elif is_identical is False:
             self.match_label.config(text="⚠️ Binary Match: NO (Content differs)", foreground="red")
+        elif 'is_identical' in dup:
+            # Same content digest, but Strict Check was off
+            self.match_label.config(text="Binary Match: not checked (content hashes match)", foreground="orange")
         else:
             self.match_label.config(text="")
             
         # Update checkbox state without triggering event
-        is_marked = self.current_index in self.marked_indices
+        is_marked = dup['source'] in self.marked_paths
         self.mark_delete_var.set(is_marked)
         
         self._update_status()
 
     def _on_mark_toggle(self):
         """Handle mark checkbox toggle."""
+        if not 0 <= self.current_index < len(self.duplicates):
+            return
+        source = self.duplicates[self.current_index]['source']
         if self.mark_delete_var.get():
-            self.marked_indices.add(self.current_index)
+            self.marked_paths.add(source)
         else:
-            self.marked_indices.discard(self.current_index)
+            self.marked_paths.discard(source)
             
         self._refresh_list_item(self.current_index)
         self._update_process_btn()
+    
+    def _list_text(self, dup):
+        """Listbox text for a duplicate."""
+        source = dup['source']
+        name = self._names.get(source)
+        if name is None:
+            name = self._names[source] = os.path.basename(source)
+        if source in self.marked_paths:
+            return f"[DEL] {name}"
+        return name
         
     def _refresh_list_item(self, index):
-        """Update listbox text for item."""
-        if 0 <= index < len(self.duplicates):
-            name = os.path.basename(self.duplicates[index]['source'])
-            if index in self.marked_indices:
-                name = f"[DEL] {name}"
-                self.duplicate_list.itemconfig(index, foreground='red')
-            else:
-                self.duplicate_list.itemconfig(index, foreground='')
-            
-            self.duplicate_list.delete(index)
-            self.duplicate_list.insert(index, name)
-            
-            # Reselect if needed
-            if index == self.current_index:
-                self.duplicate_list.selection_set(index)
+        """Update listbox text for item (only if it is on screen)."""
+        row = index - self.visible_start
+        if not (0 <= row < LIST_ROWS and index < len(self.duplicates)):
+            return
+        
+        dup = self.duplicates[index]
+        self.duplicate_list.delete(row)
+        self.duplicate_list.insert(row, self._list_text(dup))
+        self.duplicate_list.itemconfig(row, foreground='red' if dup['source'] in self.marked_paths else '')
+        
+        # Reselect if needed
+        if index == self.current_index:
+            self.duplicate_list.selection_set(row)
+    
+    def _repopulate_visible(self):
+        """Render the slice of duplicates currently scrolled into view."""
+        total = len(self.duplicates)
+        self.visible_start = max(0, min(self.visible_start, total - LIST_ROWS))
+        rows = self.duplicates[self.visible_start:self.visible_start + LIST_ROWS]
+        
+        self.duplicate_list.delete(0, tk.END)
+        if rows:
+            self.duplicate_list.insert(tk.END, *(self._list_text(dup) for dup in rows))
+        for row, dup in enumerate(rows):
+            if dup['source'] in self.marked_paths:
+                self.duplicate_list.itemconfig(row, foreground='red')
+        
+        if 0 <= self.current_index - self.visible_start < len(rows):
+            self.duplicate_list.selection_set(self.current_index - self.visible_start)
+        
+        if total:
+            self.list_scroll.set(self.visible_start / total, (self.visible_start + len(rows)) / total)
+        else:
+            self.list_scroll.set(0, 1)
+    
+    def _scroll_to(self, start):
+        """Show the duplicates starting at index start."""
+        start = max(0, min(start, len(self.duplicates) - LIST_ROWS))
+        # A disabled Listbox ignores inserts, so stay put while deleting
+        if str(self.duplicate_list['state']) == tk.DISABLED:
+            return
+        if start != self.visible_start:
+            self.visible_start = start
+            self._repopulate_visible()
+    
+    def _ensure_visible(self, index):
+        """Scroll the list just enough for index to be on screen."""
+        if index < self.visible_start:
+            self._scroll_to(index)
+        elif index >= self.visible_start + LIST_ROWS:
+            self._scroll_to(index - LIST_ROWS + 1)
+    
+    def _on_scroll(self, *args):
+        """Scrollbar command: ('moveto', fraction) or ('scroll', n, 'units'/'pages')."""
+        if args[0] == 'moveto':
+            self._scroll_to(int(float(args[1]) * len(self.duplicates)))
+        elif args[0] == 'scroll':
+            step = int(args[1]) * (LIST_ROWS if args[2] == 'pages' else 1)
+            self._scroll_to(self.visible_start + step)
+    
+    def _on_mouse_wheel(self, event):
+        """Scroll the virtual list by one row per wheel notch."""
+        step = -1 if (event.num == 4 or event.delta > 0) else 1
+        self._scroll_to(self.visible_start + step)
+        return 'break'
 
     def _update_process_btn(self):
         """Update state of process button."""
-        if self.marked_indices:
-            self.process_btn.config(state=tk.NORMAL, text=f"DELETE {len(self.marked_indices)} MARKED FILES")
+        if self.marked_paths:
+            self.process_btn.config(state=tk.NORMAL, text=f"DELETE {len(self.marked_paths)} MARKED FILES")
         else:
             self.process_btn.config(state=tk.DISABLED, text="DELETE MARKED FILES NOW")
 
@@ -272,12 +417,22 @@ class DuplicateReviewWindow:
             self.current_index += 1
             self._load_current_duplicate()
 
+    def _on_list_key(self, step):
+        """Move the current item by step rows (clamped to the list)."""
+        if self.duplicates:
+            index = max(0, min(self.current_index + step, len(self.duplicates) - 1))
+            if index != self.current_index:
+                self.current_index = index
+                self._ensure_visible(index)
+                self._load_current_duplicate()
+        return 'break'
+
     def _on_process_batch(self):
         """Process deletion of all marked files."""
-        if not self.marked_indices:
+        if not self.marked_paths:
             return
             
-        count = len(self.marked_indices)
+        count = len(self.marked_paths)
         if not messagebox.askyesno("Confirm Batch Delete", f"Are you sure you want to send {count} source files to the Recycle Bin?"):
             return
             
@@ -295,84 +450,78 @@ class DuplicateReviewWindow:
         # Start background thread
         thread = threading.Thread(
             target=self._process_deletion_thread,
-            args=(sorted(list(self.marked_indices), reverse=True),),
+            args=([dup['source'] for dup in self.duplicates if dup['source'] in self.marked_paths],),
             daemon=True
         )
         thread.start()
 
-    def _process_deletion_thread(self, indices_to_delete):
+    def _process_deletion_thread(self, paths_to_delete):
         """Background thread to handle file deletions."""
-        deleted_count = 0
-        total = len(indices_to_delete)
-        
-        # Create a copy of duplicates to work with in the thread
-        # This avoids issues if self.duplicates is modified on the main thread
-        # while this thread is running (though it shouldn't be with controls disabled)
-        duplicates_copy = list(self.duplicates) 
-
-        for i, original_index in enumerate(indices_to_delete):
-            # Check if the original_index is still valid in the current duplicates_copy
-            # This is a bit tricky because indices_to_delete are based on the *original* list.
-            # A simpler approach is to pass the actual file paths to delete.
-            # For now, we'll assume indices_to_delete are stable for the duration of this thread.
-            if original_index >= len(duplicates_copy):
-                logger.warning(f"Index {original_index} out of bounds for deletion, skipping.")
-                continue
-
-            dup = duplicates_copy[original_index]
-            filename = os.path.basename(dup['source'])
+        deleted = []
+        total = len(paths_to_delete)
+        done = 0
+        
+        # One Recycle Bin operation per folder instead of one per file;
+        # sorted so each folder's entries are visited together
+        by_dir = {}
+        for source in sorted(os.path.normpath(p) for p in paths_to_delete):
+            by_dir.setdefault(os.path.dirname(source), []).append(source)
+
+        for folder, sources in by_dir.items():
+            done += len(sources)
             
             # Update UI progress
-            self.window.after(0, lambda f=filename, step=i: self.delete_progress_label.config(text=f"Deleting: {f} ({step+1}/{total})"))
-            self.window.after(0, lambda step=i: self.delete_progress.config(value=step+1))
+            self.window.after(0, lambda f=folder, step=done: self.delete_progress_label.config(text=f"Deleting in: {f} ({step}/{total})"))
+            self.window.after(0, lambda step=done: self.delete_progress.config(value=step))
             
             if self.progress_callback:
-                self.progress_callback(i + 1, total, f"Deleting duplicate: {filename}")
+                self.progress_callback(done, total, f"Deleting duplicates in: {folder}")
             
             try:
                 # Use send2trash for safety
-                send2trash(os.path.normpath(dup['source']))
-                logger.info(f"Sent to Recycle Bin: {dup['source']}")
-                
-                # We can't safely pop from self.duplicates while in a thread and potential UI interaction
-                # So we mark it for removal/update
-                deleted_count += 1
-                
+                send2trash(sources)
+                for source in sources:
+                    logger.info("Sent to Recycle Bin: %s", source)
+                deleted.extend(sources)
             except Exception as e:
-                logger.error(f"Error deleting {dup['source']}: {e}")
+                # Find out which files of the batch could not be deleted
+                logger.warning("Batch delete failed in %s, retrying one by one: %s", folder, e)
+                for source in sources:
+                    if not os.path.lexists(source):
+                        deleted.append(source)
+                        continue
+                    try:
+                        send2trash(source)
+                        logger.info("Sent to Recycle Bin: %s", source)
+                        deleted.append(source)
+                    except Exception as e:
+                        logger.error("Error deleting %s: %s", source, e)
                 
         # Done processing, update UI on main thread
-        self.window.after(0, lambda: self._on_deletion_complete(indices_to_delete, deleted_count))
+        self.window.after(0, lambda: self._on_deletion_complete(deleted))
 
-    def _on_deletion_complete(self, indices_to_delete, deleted_count):
+    def _on_deletion_complete(self, deleted_paths):
         """Called when background deletion is finished."""
-        # Remove items from data list (reverse order)
-        # indices_to_delete are already sorted in reverse
-        for index in indices_to_delete:
-            # Ensure index is still valid after previous pops
-            if index < len(self.duplicates):
-                self.duplicates.pop(index)
+        # Remove deleted items from the data list; failed ones stay marked
+        removed = set(deleted_paths)
+        self.duplicates = [dup for dup in self.duplicates if os.path.normpath(dup['source']) not in removed]
+        self.marked_paths = {
+            path for path in self.marked_paths if os.path.normpath(path) not in removed
+        }
         
         # Refresh UI
-        self.marked_indices.clear()
         self.progress_frame.pack_forget()
         self.duplicate_list.config(state=tk.NORMAL)
         self.mark_check.config(state=tk.NORMAL)
         
-        # Rebuild listbox (simplest way to ensure alignment)
-        self.duplicate_list.delete(0, tk.END)
-        for i, dup in enumerate(self.duplicates):
-            name = os.path.basename(dup['source'])
-            self.duplicate_list.insert(tk.END, name)
-            # Re-apply [DEL] if any (marked_indices is clear now but logic remains)
-            # This part is not strictly necessary as marked_indices is cleared,
-            # but if we wanted to preserve marks for *other* items, we'd need it.
-            # For now, it's fine as it is.
+        # Back to the top of the list
+        self.current_index = 0
+        self.visible_start = 0
+        self._repopulate_visible()
             
-        messagebox.showinfo("Complete", f"Sent {deleted_count} files to Recycle Bin.")
+        messagebox.showinfo("Complete", f"Sent {len(deleted_paths)} files to Recycle Bin.")
         
         # Reset view
-        self.current_index = 0
         if self.duplicates:
             self._load_current_duplicate()
         else:
@@ -398,67 +547,186 @@ class DuplicateReviewWindow:
         """
         # Update path immediately
         path_label.config(text=image_path)
+        
+        # Videos get a placeholder right away, without going through the worker
+        if is_video_file(image_path):
+            label.config(image='', text="[Video File]\nNo Preview Available\nUse 'Open File' to view")
+            return
+        
+        # Already shown before, or at least decoded: show it right away
+        key = self._thumb_key(image_path)
+        photo = self._photo_cache.get(key)
+        if photo is not None:
+            self._photo_cache.move_to_end(key)
+            self._show_photo(label, photo, is_source)
+            return
+        img = self._cached_thumbnail(image_path)
+        if img is not None:
+            self._update_image_ui(label, img, is_source, self.current_index, key)
+            return
+        
         label.config(image='', text="Loading...")
         
-        # Increment counter to invalidate previous requests for this slot
-        # We need separate counters for source/existing or just one global? 
-        # Simpler: pass current counter value to thread
+        # Newest request wins its slot; the worker skips the ones it replaced
         self.load_counter += 1
-        # Capture current index to validate later
-        target_index = self.current_index
-        
-        thread = threading.Thread(
-            target=self._load_image_thread,
-            args=(image_path, label, is_source, target_index),
-            daemon=True
-        )
-        thread.start()
+        slot = 'source' if is_source else 'existing'
+        with self._pending_lock:
+            self._pending[slot] = (image_path, label, is_source, self.current_index, key)
+        self._preview_queue.put(('show', slot))
 
-    def _load_image_thread(self, image_path, label, is_source, target_index):
-        """Background thread for loading image."""
-        try:
-            # Check if video (simple extension check)
-            ext = os.path.splitext(image_path)[1].lower()
-            if ext in ['.mp4', '.mov', '.avi', '.mkv', '.m4v']:
-                # Is video, show placeholder
-                self.window.after(0, lambda: label.config(image='', text="[Video File]\nNo Preview Available\nUse 'Open File' to view"))
+    def _preview_worker(self):
+        """Decode previews one at a time, visible slots before prefetches."""
+        while True:
+            item = self._preview_queue.get()
+            if item is None or self._closed:
                 return
+            
+            # Serve whatever is on screen now, then the queued prefetch (if any)
+            for slot in ('source', 'existing'):
+                with self._pending_lock:
+                    request = self._pending.pop(slot, None)
+                if request is not None:
+                    self._load_image_thread(*request)
+            
+            kind, arg = item
+            if kind == 'prefetch' and not self._closed:
+                self._prefetch_one(arg)
 
+    def _load_image_thread(self, image_path, label, is_source, target_index, key=None):
+        """Decode one preview and hand it to the Tk thread (preview worker)."""
+        try:
             # Perform heavy lifting
-            img = Image.open(image_path)
-            img.thumbnail((400, 400), Image.Resampling.LANCZOS)
-            photo = ImageTk.PhotoImage(img)
+            img = self._get_thumbnail(image_path)
+            
+            # Replaced while decoding: the newer request paints the slot
+            with self._pending_lock:
+                if ('source' if is_source else 'existing') in self._pending:
+                    return
             
             # Update UI on main thread
-            self.window.after(0, lambda: self._update_image_ui(label, photo, is_source, target_index))
+            self.window.after(0, lambda: self._update_image_ui(label, img, is_source, target_index, key))
             
         except Exception as e:
-            logger.error(f"Error loading preview for {image_path}: {e}")
+            logger.error("Error loading preview for %s: %s", image_path, e)
             msg = f"Error loading image:\n{e}"
             self.window.after(0, lambda: label.config(text=msg))
 
-    def _update_image_ui(self, label, photo, is_source, target_index):
+    def _thumb_key(self, image_path):
+        """Cache key for a preview; an edited file gets a new key."""
+        try:
+            return (image_path, os.stat(image_path).st_mtime_ns)
+        except OSError:
+            return None
+
+    def _cached_thumbnail(self, image_path):
+        """
+        Get an already decoded thumbnail.
+        
+        Args:
+            image_path: Path to image file
+            
+        Returns:
+            PIL image, or None if not cached
+        """
+        key = self._thumb_key(image_path)
+        with _thumb_lock:
+            img = _thumb_cache.get(key)
+            if img is not None:
+                _thumb_cache.move_to_end(key)
+        return img
+
+    def _get_thumbnail(self, image_path):
+        """
+        Decode a preview-sized thumbnail, using the cache (worker thread).
+        
+        Args:
+            image_path: Path to image file
+            
+        Returns:
+            PIL image fitted into PREVIEW_SIZE
+        """
+        key = self._thumb_key(image_path)
+        with _thumb_lock:
+            img = _thumb_cache.get(key)
+            if img is not None:
+                _thumb_cache.move_to_end(key)
+                return img
+        
+        img = _vips_thumbnail(image_path) if pyvips else None
+        if img is None:
+            with Image.open(image_path) as src:
+                # JPEG: let libjpeg downscale while decoding (much cheaper), to the
+                # smallest DCT scale that still covers the preview box
+                src.draft('RGB', PREVIEW_SIZE)
+                src.thumbnail(PREVIEW_SIZE, Image.Resampling.LANCZOS)
+                # Keep only the small result; the full decode goes with the file
+                img = src.copy()
+        
+        if key is not None:
+            with _thumb_lock:
+                _thumb_cache[key] = img
+                _thumb_cache.move_to_end(key)
+                while len(_thumb_cache) > THUMB_CACHE_SIZE:
+                    _thumb_cache.popitem(last=False)
+        return img
+
+    def _prefetch_neighbours(self):
+        """Decode the previous and next pairs in the background."""
+        for index in (self.current_index + 1, self.current_index - 1):
+            if 0 <= index < len(self.duplicates):
+                dup = self.duplicates[index]
+                for path in (dup['source'], dup['existing']):
+                    if not is_video_file(path):
+                        self._preview_queue.put(('prefetch', path))
+
+    def _prefetch_one(self, image_path):
+        """Warm the cache for one image; failures show up when it is viewed."""
+        try:
+            self._get_thumbnail(image_path)
+        except Exception as e:
+            logger.debug("Prefetch failed for %s: %s", image_path, e)
+
+    def _on_destroy(self, event):
+        """Stop pending preview work when the window closes."""
+        if event.widget is self.window:
+            self._closed = True
+            with self._pending_lock:
+                self._pending.clear()
+            self._preview_queue.put(None)
+            self._photo_cache.clear()
+
+    def _update_image_ui(self, label, img, is_source, target_index, key=None):
         """Update UI with loaded image if we are still on the same item."""
         if target_index != self.current_index:
             return 
             
         try:
-            # Store reference
-            if is_source:
-                self.source_photo = photo
-            else:
-                self.existing_photo = photo
-                
-            label.config(image=photo, text="")
+            photo = ImageTk.PhotoImage(img)
+            if key is not None:
+                self._photo_cache[key] = photo
+                while len(self._photo_cache) > PHOTO_CACHE_SIZE:
+                    self._photo_cache.popitem(last=False)
+            
+            self._show_photo(label, photo, is_source)
         except Exception as e:
-            logger.error(f"Error updating UI: {e}") 
+            logger.error("Error updating UI: %s", e) 
+
+    def _show_photo(self, label, photo, is_source):
+        """Display a PhotoImage in a preview slot, keeping a reference to it."""
+        # Store reference
+        if is_source:
+            self.source_photo = photo
+        else:
+            self.existing_photo = photo
+            
+        label.config(image=photo, text="")
 
     
     def _on_list_select(self, event):
         """Handle listbox selection."""
         selection = self.duplicate_list.curselection()
         if selection:
-            self.current_index = selection[0]
+            self.current_index = self.visible_start + selection[0]
             self._load_current_duplicate()
     
     def _on_skip(self):
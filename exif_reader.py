@@ -17,29 +17,77 @@ For Videos:
 import os
 import logging
 from datetime import datetime
+from functools import lru_cache
 from PIL import Image
-from PIL.ExifTags import TAGS
+import piexif
 import pillow_heif
 
 # Register HEIF opener
 pillow_heif.register_heif_opener()
 
 from scanner import IMAGE_EXTENSIONS, VIDEO_EXTENSIONS
-from video_reader import validate_video, get_video_date
+from video_reader import validate_video, get_video_date, probe_video
+import _exif_cache
 
 logger = logging.getLogger(__name__)
 
+# Frozen copies for the per-file extension checks
+VIDEO_EXTS = frozenset(VIDEO_EXTENSIONS)
+IMAGE_EXTS = frozenset(IMAGE_EXTENSIONS)
 
-def validate_image(file_path):
+# Extensions whose EXIF is read straight from the APP1 segment with piexif
+_JPEG_EXTS = frozenset({'.jpg', '.jpeg'})
+
+# Formats whose EXIF is parsed from the header at open time, so it can be read
+# from the same handle that is verified (PNG etc. decode the image for it)
+_HEADER_EXIF_FORMATS = frozenset({'JPEG', 'MPO'})
+
+# Leading signatures of the supported image formats (quick validation)
+_IMAGE_MAGIC = (
+    b'\xff\xd8\xff',        # JPEG
+    b'\x89PNG\r\n\x1a\n',   # PNG
+    b'GIF8',                # GIF
+    b'BM',                  # BMP
+    b'II*\x00',             # TIFF (little-endian)
+    b'MM\x00*',             # TIFF (big-endian)
+)
+
+# ISO-BMFF brands of HEIF/HEIC files ('ftyp' box at offset 4)
+_HEIF_BRANDS = frozenset({b'heic', b'heix', b'heim', b'heis', b'hevc', b'hevx', b'mif1', b'msf1'})
+
+
+def validate_image(file_path, deep=False):
     """
     Validate if file is a valid image that can be opened.
     
+    By default only the file signature is checked (one 12-byte read);
+    deep=True also opens the image with PIL and verifies its data.
+    
     Args:
         file_path: Path to image file
+        deep: Run PIL's full verify
         
     Returns:
         tuple: (is_valid: bool, error_message: str or None)
     """
+    if not deep:
+        try:
+            with open(file_path, 'rb') as f:
+                head = f.read(12)
+        except OSError as e:
+            error_msg = f"Cannot read image: {str(e)}"
+            logger.warning("%s - %s", error_msg, file_path)
+            return (False, error_msg)
+        
+        if (head.startswith(_IMAGE_MAGIC)
+                or (head[:4] == b'RIFF' and head[8:12] == b'WEBP')
+                or (head[4:8] == b'ftyp' and head[8:12] in _HEIF_BRANDS)):
+            return (True, None)
+        
+        error_msg = "Cannot identify image: unknown image format"
+        logger.warning("%s - %s", error_msg, file_path)
+        return (False, error_msg)
+    
     try:
         with Image.open(file_path) as img:
             # Try to verify the image
@@ -47,27 +95,39 @@ def validate_image(file_path):
         return (True, None)
     except Exception as e:
         error_msg = f"Cannot identify image: {str(e)}"
-        logger.warning(f"{error_msg} - {file_path}")
+        logger.warning("%s - %s", error_msg, file_path)
         return (False, error_msg)
 
 
-def get_image_date(file_path):
+def get_image_date(file_path, stat_result=None):
     """
     Extract date from image file.
     
     Args:
         file_path: Path to image file
+        stat_result: Optional os.stat_result of file_path (avoids a second stat)
         
     Returns:
         datetime object or None if all methods fail
     """
+    # Dates of unchanged files come from the on-disk cache
+    found = False
+    if stat_result is None:
+        try:
+            stat_result = os.stat(file_path)
+        except OSError:
+            pass
+    if stat_result is not None:
+        found, exif_date = _exif_cache.lookup(file_path, stat_result)
+    
     # Try EXIF data first
-    exif_date = _get_exif_date(file_path)
+    if not found:
+        exif_date = _get_exif_date(file_path)
     if exif_date:
         return exif_date
     
     # Fallback to file modified time
-    return _get_file_modified_date(file_path)
+    return _get_file_modified_date(file_path, stat_result)
 
 
 def _get_exif_date(file_path):
@@ -85,39 +145,89 @@ def _get_exif_date(file_path):
     Returns:
         datetime object or None
     """
+    if file_path[file_path.rfind('.'):].lower() in _JPEG_EXTS:
+        try:
+            return _get_jpeg_exif_date(file_path)
+        except Exception as e:
+            # Unusual layout: let PIL have a go
+            logger.debug("piexif could not read %s, falling back to PIL: %s", file_path, e)
+    
     try:
         with Image.open(file_path) as img:
-            # Get EXIF data
-            exif_data = img._getexif()
-            
-            if not exif_data:
-                logger.debug(f"No EXIF data found: {file_path}")
-                return None
-            
-            # Try DateTimeOriginal (most reliable)
-            date_str = exif_data.get(36867)  # DateTimeOriginal
-            if date_str:
-                return _parse_exif_datetime(date_str)
-            
-            # Try DateTimeDigitized
-            date_str = exif_data.get(36868)  # DateTimeDigitized
-            if date_str:
-                return _parse_exif_datetime(date_str)
-            
-            # Try DateTime
-            date_str = exif_data.get(306)  # DateTime
-            if date_str:
-                return _parse_exif_datetime(date_str)
-            
-            logger.debug(f"No date tags in EXIF: {file_path}")
+            return _exif_date_from_image(img, file_path)
+    except Exception as e:
+        logger.warning("Error reading EXIF from %s: %s", file_path, e)
+        return None
+
+
+def _get_jpeg_exif_date(file_path):
+    """
+    Extract the EXIF date of a JPEG without building a PIL image.
+    
+    piexif walks the JPEG segments up to APP1 and parses only the EXIF block.
+    
+    Args:
+        file_path: Path to JPEG file
+        
+    Returns:
+        datetime object or None
+    """
+    exif_dict = piexif.load(file_path)
+    exif_ifd = exif_dict['Exif']
+    date_bytes = (
+        exif_ifd.get(piexif.ExifIFD.DateTimeOriginal)
+        or exif_ifd.get(piexif.ExifIFD.DateTimeDigitized)
+        or exif_dict['0th'].get(piexif.ImageIFD.DateTime)
+    )
+    if not date_bytes:
+        logger.debug("No date tags in EXIF: %s", file_path)
+        return None
+    return _parse_exif_datetime_bytes(date_bytes)
+
+
+def _exif_date_from_image(img, file_path):
+    """
+    Extract the EXIF date from an already opened image.
+    
+    Args:
+        img: Open PIL image
+        file_path: Path to image file (for log messages)
+        
+    Returns:
+        datetime object or None
+    """
+    try:
+        # Get EXIF data
+        exif_data = img._getexif()
+        
+        if not exif_data:
+            logger.debug("No EXIF data found: %s", file_path)
             return None
+        
+        # Try DateTimeOriginal (most reliable)
+        date_str = exif_data.get(36867)  # DateTimeOriginal
+        if date_str:
+            return _parse_exif_datetime(date_str)
+        
+        # Try DateTimeDigitized
+        date_str = exif_data.get(36868)  # DateTimeDigitized
+        if date_str:
+            return _parse_exif_datetime(date_str)
+        
+        # Try DateTime
+        date_str = exif_data.get(306)  # DateTime
+        if date_str:
+            return _parse_exif_datetime(date_str)
+        
+        logger.debug("No date tags in EXIF: %s", file_path)
+        return None
             
     except AttributeError:
         # _getexif() not available (e.g., PNG files)
-        logger.debug(f"No EXIF support for file type: {file_path}")
+        logger.debug("No EXIF support for file type: %s", file_path)
         return None
     except Exception as e:
-        logger.warning(f"Error reading EXIF from {file_path}: {e}")
+        logger.warning("Error reading EXIF from %s: %s", file_path, e)
         return None
 
 
@@ -125,7 +235,8 @@ def _parse_exif_datetime(date_str):
     """
     Parse EXIF datetime string.
     
-    EXIF format: "YYYY:MM:DD HH:MM:SS"
+    EXIF format: "YYYY:MM:DD HH:MM:SS" (fixed width, so it is sliced directly
+    instead of going through strptime)
     
     Args:
         date_str: EXIF datetime string
@@ -133,36 +244,88 @@ def _parse_exif_datetime(date_str):
     Returns:
         datetime object or None
     """
+    s = date_str.strip('\x00 \t')
+    try:
+        if len(s) >= 19 and s[4] == ':' and s[7] == ':' and s[10] == ' ':
+            return datetime(int(s[0:4]), int(s[5:7]), int(s[8:10]),
+                            int(s[11:13]), int(s[14:16]), int(s[17:19]))
+        # Alternative format without time
+        if len(s) >= 10 and s[4] == ':' and s[7] == ':':
+            return datetime(int(s[0:4]), int(s[5:7]), int(s[8:10]))
+    except (ValueError, TypeError):
+        pass
+    logger.warning("Could not parse EXIF date: %s", date_str)
+    return None
+
+
+def _parse_exif_datetime_bytes(date_bytes):
+    """
+    Parse a raw EXIF datetime (as piexif returns it) without decoding it first.
+    
+    Args:
+        date_bytes: EXIF datetime bytes, e.g. b"2021:06:14 10:22:01"
+        
+    Returns:
+        datetime object or None
+    """
+    b = date_bytes.strip(b'\x00 \t')
     try:
-        # EXIF datetime format
-        return datetime.strptime(date_str, "%Y:%m:%d %H:%M:%S")
+        # int() parses ASCII digits straight from bytes; 58 is ':', 32 is ' '
+        if len(b) >= 19 and b[4] == 58 and b[7] == 58 and b[10] == 32:
+            return datetime(int(b[0:4]), int(b[5:7]), int(b[8:10]),
+                            int(b[11:13]), int(b[14:16]), int(b[17:19]))
+        if len(b) >= 10 and b[4] == 58 and b[7] == 58:
+            return datetime(int(b[0:4]), int(b[5:7]), int(b[8:10]))
     except ValueError:
-        try:
-            # Try alternative format without time
-            return datetime.strptime(date_str, "%Y:%m:%d")
-        except ValueError:
-            logger.warning(f"Could not parse EXIF date: {date_str}")
-            return None
+        pass
+    logger.warning("Could not parse EXIF date: %s", date_bytes.decode('ascii', 'replace'))
+    return None
 
 
-def _get_file_modified_date(file_path):
+def _get_file_modified_date(file_path, stat_result=None):
     """
     Get file modified time as fallback.
     
     Args:
         file_path: Path to file
+        stat_result: Optional os.stat_result of file_path (avoids a second stat)
         
     Returns:
         datetime object or None
     """
     try:
-        mtime = os.path.getmtime(file_path)
-        return datetime.fromtimestamp(mtime)
+        if stat_result is None:
+            stat_result = os.stat(file_path)
+        return datetime.fromtimestamp(stat_result.st_mtime)
     except Exception as e:
-        logger.error(f"Could not get modified time for {file_path}: {e}")
+        logger.error("Could not get modified time for %s: %s", file_path, e)
         return None
 
 
+@lru_cache(maxsize=4096)
+def _classify_ext(ext):
+    """Media kind of a (raw, any-case) file suffix: 'video', 'image' or None."""
+    ext = ext.lower()
+    if ext in VIDEO_EXTS:
+        return 'video'
+    if ext in IMAGE_EXTS:
+        return 'image'
+    return None
+
+
+def _classify(file_path):
+    """
+    Classify a file by extension, caching per suffix rather than per path.
+    
+    Args:
+        file_path: Path to file
+        
+    Returns:
+        str: 'video', 'image' or None
+    """
+    return _classify_ext(file_path[file_path.rfind('.'):])
+
+
 def is_video_file(file_path):
     """
     Check if file is a video based on extension.
@@ -173,8 +336,7 @@ def is_video_file(file_path):
     Returns:
         bool: True if video file, False otherwise
     """
-    _, ext = os.path.splitext(file_path)
-    return ext.lower() in VIDEO_EXTENSIONS
+    return _classify(file_path) == 'video'
 
 
 def is_image_file(file_path):
@@ -187,37 +349,104 @@ def is_image_file(file_path):
     Returns:
         bool: True if image file, False otherwise
     """
-    _, ext = os.path.splitext(file_path)
-    return ext.lower() in IMAGE_EXTENSIONS
+    return _classify(file_path) == 'image'
 
 
-def validate_media(file_path):
+def validate_media(file_path, deep=False):
     """
     Validate if file is a valid media file (image or video).
     
     Args:
         file_path: Path to media file
+        deep: For images, run PIL's full verify instead of a signature check
         
     Returns:
         tuple: (is_valid: bool, error_message: str or None)
     """
-    if is_video_file(file_path):
+    if _classify(file_path) == 'video':
         return validate_video(file_path)
     else:
-        return validate_image(file_path)
+        return validate_image(file_path, deep=deep)
 
 
-def get_media_date(file_path):
+def get_media_date(file_path, stat_result=None):
     """
     Extract date from media file (image or video).
     
     Args:
         file_path: Path to media file
+        stat_result: Optional os.stat_result of file_path (avoids a second stat)
         
     Returns:
         datetime object or None if all methods fail
     """
-    if is_video_file(file_path):
-        return get_video_date(file_path)
+    if _classify(file_path) == 'video':
+        return get_video_date(file_path, stat_result)
     else:
-        return get_image_date(file_path)
+        return get_image_date(file_path, stat_result)
+
+
+def probe_media(file_path, stat_result=None, deep=False):
+    """
+    Validate a media file and extract its date in one pass.
+    
+    Images only get the signature check of validate_image and no PIL image
+    is built; JPEG dates are read by piexif. deep=True opens images once with
+    PIL and verifies their data (for JPEGs the date comes from the same
+    handle). Videos take a single ffprobe run.
+    Equivalent to validate_media followed by get_media_date.
+    
+    Args:
+        file_path: Path to media file
+        stat_result: Optional os.stat_result of file_path (avoids a second stat)
+        deep: Verify image data with PIL instead of checking the signature only
+        
+    Returns:
+        tuple: (is_valid: bool, date: datetime or None, error_message: str or None)
+    """
+    if _classify(file_path) == 'video':
+        return probe_video(file_path, stat_result)
+    
+    if stat_result is None:
+        try:
+            stat_result = os.stat(file_path)
+        except OSError:
+            pass
+    
+    # Unchanged file that was valid before: no need to open it again. The
+    # cache does not record how deep the check went, so deep mode bypasses it
+    if stat_result is not None and not deep:
+        found, exif_date = _exif_cache.lookup(file_path, stat_result)
+        if found:
+            return (True, exif_date or _get_file_modified_date(file_path, stat_result), None)
+    
+    header_exif = False
+    if deep:
+        try:
+            with Image.open(file_path) as img:
+                header_exif = img.format in _HEADER_EXIF_FORMATS
+                if header_exif:
+                    # Read EXIF before verify(), which leaves the image unusable
+                    exif_date = _exif_date_from_image(img, file_path)
+                img.verify()
+        except Exception as e:
+            error_msg = f"Cannot identify image: {str(e)}"
+            logger.warning("%s - %s", error_msg, file_path)
+            return (False, None, error_msg)
+    else:
+        is_valid, error_msg = validate_image(file_path)
+        if not is_valid:
+            return (False, None, error_msg)
+    
+    if not header_exif:
+        exif_date = _get_exif_date(file_path)
+    
+    # Only files that passed validation are cached, so a hit also means "valid"
+    if stat_result is not None:
+        _exif_cache.store(file_path, stat_result, exif_date)
+    
+    if exif_date:
+        return (True, exif_date, None)
+    
+    # Fallback to file modified time
+    return (True, _get_file_modified_date(file_path, stat_result), None)
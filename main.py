@@ -11,8 +11,11 @@ from tkinter import ttk, filedialog, messagebox, scrolledtext
 import threading
 import queue
 import logging
+import logging.handlers
 import json
+from collections import deque
 from datetime import datetime
+from functools import lru_cache
 
 from utils import setup_logging
 from copier import process_media
@@ -20,6 +23,35 @@ from duplicate_ui import DuplicateReviewWindow
 
 logger = logging.getLogger(__name__)
 
+# Progress queue polling interval while processing / while idle (ms)
+POLL_BUSY_MS = 50
+POLL_IDLE_MS = 750
+
+# Write buffer for the duplicate report (one line per duplicate)
+REPORT_BUFFER_SIZE = 1 << 20
+
+# Per-run log folders are created under here
+_LOGS_BASE = os.path.join(os.path.dirname(__file__), 'logs')
+
+# Line format of the session log
+_SESSION_LOG_FORMATTER = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+
+@lru_cache(maxsize=None)
+def _resource_path(relative_path):
+    """
+    Resolve a bundled resource once; the base folder cannot change at runtime.
+    
+    Args:
+        relative_path: Resource path relative to the app folder
+        
+    Returns:
+        str: Absolute path to the resource
+    """
+    # PyInstaller creates a temp folder and stores path in _MEIPASS
+    base_path = getattr(sys, '_MEIPASS', None) or os.path.abspath(".")
+    return f"{base_path}{os.sep}{relative_path}"
+
 
 class MainWindow:
     """Main application window."""
@@ -49,10 +81,20 @@ class MainWindow:
         self.move_files = tk.BooleanVar(value=False)
         self.delete_duplicates = tk.BooleanVar(value=False)
         self.is_processing = False
-        self.progress_queue = queue.Queue()
-        self.progress_queue = queue.Queue()
+        # Worker -> UI terminal messages ('complete'/'error'); deque
+        # append/popleft are thread-safe
+        self.progress_queue = deque()
+        # Progress is a single slot: workers overwrite it, the UI shows the
+        # newest value when the event is set
+        self._latest_progress = None
+        self._progress_event = threading.Event()
+        self._poll_id = None  # pending after() of _check_queue
+        self._last_percent = None  # whole percent last shown on the progress bar
+        self._last_status = None  # progress text last shown in the status label
         self.current_log_dir = None
+        self._session_timestamp = None  # "%Y%m%d_%H%M%S" of the current run
         self.dest_history_list = []
+        self.max_workers = None  # None = copier default; set via config.json
         
         # Results
         self.results = None
@@ -92,6 +134,11 @@ class MainWindow:
                     # Update combobox values if exists
                     if hasattr(self, 'dest_combo'):
                         self.dest_combo['values'] = self.dest_history_list
+                    
+                    # Optional worker count override
+                    max_workers = config.get('max_workers')
+                    if isinstance(max_workers, int) and max_workers > 0:
+                        self.max_workers = max_workers
                         
         except Exception as e:
             logger.warning(f"Could not load config: {e}")
@@ -126,6 +173,8 @@ class MainWindow:
             config = {
                 'dest_history': self.dest_history_list
             }
+            if self.max_workers:
+                config['max_workers'] = self.max_workers
             with open(config_path, 'w') as f:
                 json.dump(config, f)
         except Exception as e:
@@ -133,13 +182,7 @@ class MainWindow:
 
     def resource_path(self, relative_path):
         """ Get absolute path to resource, works for dev and for PyInstaller """
-        try:
-            # PyInstaller creates a temp folder and stores path in _MEIPASS
-            base_path = sys._MEIPASS
-        except Exception:
-            base_path = os.path.abspath(".")
-
-        return os.path.join(base_path, relative_path)
+        return _resource_path(relative_path)
 
     
     def _build_ui(self):
@@ -194,6 +237,20 @@ class MainWindow:
         )
         self.start_btn.pack()
         
+        # Progress and log panes are only needed once a run starts; build
+        # them after the window is up so it appears sooner
+        self._main_frame = main_frame
+        self.progress_bar = None
+        self.status_label = None
+        self.log_text = None
+        self.root.after_idle(self._build_lower_ui)
+    
+    def _build_lower_ui(self):
+        """Build the progress and log sections (once)."""
+        if self.log_text is not None:
+            return
+        main_frame = self._main_frame
+        
         # Progress section
         progress_frame = ttk.LabelFrame(main_frame, text="Progress", padding=10)
         progress_frame.pack(fill=tk.X, pady=10)
@@ -251,6 +308,9 @@ class MainWindow:
             messagebox.showwarning("Warning", "Processing already in progress")
             return
         
+        # Clicked before the idle build ran
+        self._build_lower_ui()
+        
         # Clear log
         self.log_text.config(state=tk.NORMAL)
         self.log_text.delete(1.0, tk.END)
@@ -258,6 +318,7 @@ class MainWindow:
         
         # Reset progress
         self.progress_bar['value'] = 0
+        self._last_percent = 0
         
         # Disable start button
         self.start_btn.config(state=tk.DISABLED)
@@ -269,15 +330,19 @@ class MainWindow:
         delete_dups = self.delete_duplicates.get()
         
         # Create session log directory
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        logs_base = os.path.join(os.path.dirname(__file__), 'logs')
-        self.current_log_dir = os.path.join(logs_base, timestamp)
+        self._session_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.current_log_dir = os.path.join(_LOGS_BASE, self._session_timestamp)
         os.makedirs(self.current_log_dir, exist_ok=True)
         
-        # Add a file handler for the session log
+        # Add a handler for the session log. Logging threads only enqueue the
+        # record; a listener thread formats it and writes the file.
         session_log_file = os.path.join(self.current_log_dir, "session.log")
-        self.session_handler = logging.FileHandler(session_log_file, encoding='utf-8')
-        self.session_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+        file_handler = logging.FileHandler(session_log_file, encoding='utf-8')
+        file_handler.setFormatter(_SESSION_LOG_FORMATTER)
+        log_queue = queue.SimpleQueue()
+        self.session_listener = logging.handlers.QueueListener(log_queue, file_handler)
+        self.session_listener.start()
+        self.session_handler = logging.handlers.QueueHandler(log_queue)
         logging.getLogger().addHandler(self.session_handler)
         
         self._log(f"Session logs will be saved to: {self.current_log_dir}")
@@ -291,6 +356,11 @@ class MainWindow:
         
         mode = "Moving" if move else "Copying"
         self._log(f"Processing started ({mode})...")
+        
+        # Switch to the fast polling cadence now rather than after the idle wait
+        if self._poll_id is not None:
+            self.root.after_cancel(self._poll_id)
+        self._check_queue()
     
     def _worker_thread(self, source_folder, dest_folder, move_files, delete_duplicates, log_dir):
         """
@@ -311,18 +381,38 @@ class MainWindow:
                 move_files=move_files,
                 delete_duplicates=delete_duplicates,
                 log_dir=log_dir,
-                progress_callback=self._progress_callback
+                progress_callback=self._progress_callback,
+                max_workers=self.max_workers
+            )
+            
+            # Write the duplicate report here rather than on the UI thread
+            results['duplicate_report_path'] = (
+                self._generate_duplicate_report(results['duplicates'], log_dir)
+                if results['duplicates'] else None
             )
             
             # Store results
             self.results = results
             
             # Signal completion
-            self.progress_queue.put(('complete', results))
+            self.progress_queue.append(('complete', results))
             
         except Exception as e:
             logger.error(f"Error in worker thread: {e}")
-            self.progress_queue.put(('error', str(e)))
+            self.progress_queue.append(('error', str(e)))
+        
+        finally:
+            self._close_session_log()
+    
+    def _close_session_log(self):
+        """Detach the session log handler and write out what it still holds."""
+        logging.getLogger().removeHandler(self.session_handler)
+        # stop() waits until the listener has written every queued record
+        self.session_listener.stop()
+        for handler in self.session_listener.handlers:
+            handler.close()
+        self.session_handler = None
+        self.session_listener = None
     
     def _progress_callback(self, current, total, status):
         """
@@ -333,7 +423,8 @@ class MainWindow:
             total: Total items
             status: Status message
         """
-        self.progress_queue.put(('progress', (current, total, status)))
+        self._latest_progress = (current, total, status)
+        self._progress_event.set()
     
     def _start_queue_monitor(self):
         """Start monitoring the progress queue."""
@@ -341,31 +432,64 @@ class MainWindow:
     
     def _check_queue(self):
         """Check progress queue for updates."""
-        try:
-            while True:
-                msg_type, data = self.progress_queue.get_nowait()
+        while self.progress_queue:
+            msg_type, data = self.progress_queue.popleft()
+            
+            # Show progress made before the run finished first
+            self._apply_progress()
                 
-                if msg_type == 'progress':
-                    current, total, status = data
-                    # Update progress bar
-                    if total > 0:
-                        percent = (current / total) * 100
-                        self.progress_bar['value'] = percent
-                    # Update status
-                    self.status_label.config(text=status)
-                    self._log(status)
-                    
-                elif msg_type == 'complete':
-                    self._on_processing_complete(data)
-                    
-                elif msg_type == 'error':
-                    self._on_processing_error(data)
-                    
-        except queue.Empty:
-            pass
+            if msg_type == 'complete':
+                self._on_processing_complete(data)
+                
+            elif msg_type == 'error':
+                self._on_processing_error(data)
+        
+        self._apply_progress()
         
-        # Schedule next check
-        self.root.after(100, self._check_queue)
+        # Schedule next check: quick while a run is going, lazy when idle
+        delay = POLL_BUSY_MS if self.is_processing else POLL_IDLE_MS
+        self._poll_id = self.root.after(delay, self._check_queue)
+    
+    def _apply_progress(self):
+        """Show the newest progress update, if one arrived since the last call."""
+        if not self._progress_event.is_set():
+            return
+        # Clear before reading: a value written after this is picked up next time
+        self._progress_event.clear()
+        current, total, status = self._latest_progress
+        # Update progress bar (indeterminate while still scanning)
+        if total is None:
+            self._set_progress_indeterminate(True)
+        else:
+            self._set_progress_indeterminate(False)
+            if total > 0:
+                percent = (current * 100) // total
+                # The bar cannot show less than a whole percent anyway
+                if percent != self._last_percent:
+                    self._last_percent = percent
+                    self.progress_bar['value'] = percent
+        # Update status
+        if status != self._last_status:
+            self._last_status = status
+            self.status_label.config(text=status)
+        self._log(status)
+    
+    def _set_progress_indeterminate(self, indeterminate):
+        """
+        Switch the progress bar between a bouncing and a percentage display.
+        
+        Args:
+            indeterminate: True while the total number of files is unknown
+        """
+        mode = 'indeterminate' if indeterminate else 'determinate'
+        if str(self.progress_bar['mode']) == mode:
+            return
+        if indeterminate:
+            self.progress_bar.config(mode=mode)
+            self.progress_bar.start(20)
+        else:
+            self.progress_bar.stop()
+            self.progress_bar.config(mode=mode)
     
     def _on_processing_complete(self, results):
         """
@@ -376,75 +500,78 @@ class MainWindow:
         """
         self.is_processing = False
         self.start_btn.config(state=tk.NORMAL)
+        self._set_progress_indeterminate(False)
         self.progress_bar['value'] = 100
         
-        # Remove session handler
-        if hasattr(self, 'session_handler') and self.session_handler:
-            logging.getLogger().removeHandler(self.session_handler)
-            self.session_handler.close()
-            self.session_handler = None
-        
-        # Log summary
-        self._log(f"\n{'='*50}")
-        self._log("Processing Complete!")
-        self._log(f"{'='*50}")
-        action = "moved" if self.move_files.get() else "copied"
+        # Log summary (collected and written to the log pane in one go)
+        success_count = results['success_count']
+        duplicate_count = results['duplicate_count']
+        invalid_count = results['invalid_count']
+        error_count = results['error_count']
         image_count = results.get('image_count', 0)
         video_count = results.get('video_count', 0)
-        self._log(f"Successfully {action}: {results['success_count']} files")
-        self._log(f"  - Images: {image_count}, Videos: {video_count}")
-        self._log(f"Duplicates found: {results['duplicate_count']} files")
-        self._log(f"Invalid files (skipped): {results['invalid_count']} files")
-        self._log(f"Errors: {results['error_count']} files")
+        duplicates = results['duplicates']
+        errors = results['errors']
+        moved = self.move_files.get()
+        
+        action = "moved" if moved else "copied"
+        lines = [
+            f"\n{'='*50}",
+            "Processing Complete!",
+            f"{'='*50}",
+            f"Successfully {action}: {success_count} files",
+            f"  - Images: {image_count}, Videos: {video_count}",
+            f"Duplicates found: {duplicate_count} files",
+            f"Invalid files (skipped): {invalid_count} files",
+            f"Errors: {error_count} files",
+        ]
         
         # Log invalid files info
-        if results['invalid_count'] > 0 and results.get('invalid_log_path'):
-            self._log(f"\nInvalid files log: {results['invalid_log_path']}")
+        if invalid_count > 0 and results.get('invalid_log_path'):
+            lines.append(f"\nInvalid files log: {results['invalid_log_path']}")
         
         # Log success report info
-        if results['success_count'] > 0 and results.get('success_log_path'):
-            self._log(f"Success report: {results['success_log_path']}")
-        
-        # Generate duplicate report
-        duplicate_report_path = None
-        if results['duplicates']:
-            duplicate_report_path = self._generate_duplicate_report(results['duplicates'], self.current_log_dir)
-            if duplicate_report_path:
-                self._log(f"Duplicate report: {duplicate_report_path}")
-            
+        if success_count > 0 and results.get('success_log_path'):
+            lines.append(f"Success report: {results['success_log_path']}")
+        
+        # Duplicate report (written by the worker thread)
+        duplicate_report_path = results.get('duplicate_report_path')
+        if duplicate_report_path:
+            lines.append(f"Duplicate report: {duplicate_report_path}")
+        
+        # Log errors if any
+        if errors:
+            rule = '=' * 50
+            lines += [f"\n{rule}", "Errors:", rule]
+            lines += [f"  {error['source']}: {error['error']}" for error in errors[:10]]  # Show first 10
+            if len(errors) > 10:
+                lines.append(f"  ... and {len(errors) - 10} more errors")
+        
+        self._log_batch(lines)
+        
+        if duplicates:
             # Ask to open duplicate review
             response = messagebox.askyesno(
                 "Duplicates Found",
-                f"Found {results['duplicate_count']} duplicate files.\n\n"
+                f"Found {duplicate_count} duplicate files.\n\n"
                 "Would you like to review them now?"
             )
             
             if response:
-                self._open_duplicate_review(results['duplicates'])
-        
-        # Log errors if any
-        if results['errors']:
-            self._log(f"\n{'='*50}")
-            self._log("Errors:")
-            self._log(f"{'='*50}")
-            for error in results['errors'][:10]:  # Show first 10
-                self._log(f"  {error['source']}: {error['error']}")
-            if len(results['errors']) > 10:
-                self._log(f"  ... and {len(results['errors']) - 10} more errors")
+                self._open_duplicate_review(duplicates)
         
         self.status_label.config(text="Processing complete")
+        self._last_status = None
         
-        label = "Moved" if self.move_files.get() else "Copied"
-        image_count = results.get('image_count', 0)
-        video_count = results.get('video_count', 0)
+        label = "Moved" if moved else "Copied"
         messagebox.showinfo(
             "Complete",
             f"Processing complete!\n\n"
-            f"{label}: {results['success_count']}\n"
+            f"{label}: {success_count}\n"
             f"  (Images: {image_count}, Videos: {video_count})\n"
-            f"Duplicates: {results['duplicate_count']}\n"
-            f"Invalid files: {results['invalid_count']}\n"
-            f"Errors: {results['error_count']}"
+            f"Duplicates: {duplicate_count}\n"
+            f"Invalid files: {invalid_count}\n"
+            f"Errors: {error_count}"
         )
     
     def _on_processing_error(self, error_msg):
@@ -456,13 +583,9 @@ class MainWindow:
         """
         self.is_processing = False
         self.start_btn.config(state=tk.NORMAL)
+        self._set_progress_indeterminate(False)
         self.status_label.config(text="Error occurred")
-        
-        # Remove session handler
-        if hasattr(self, 'session_handler') and self.session_handler:
-            logging.getLogger().removeHandler(self.session_handler)
-            self.session_handler.close()
-            self.session_handler = None
+        self._last_status = None
         
         self._log(f"\nERROR: {error_msg}")
         
@@ -470,7 +593,7 @@ class MainWindow:
     
     def _generate_duplicate_report(self, duplicates, log_dir):
         """
-        Generate duplicate report file.
+        Generate duplicate report file (touches no widgets; runs on the worker thread).
         
         Args:
             duplicates: List of duplicate dicts
@@ -480,22 +603,22 @@ class MainWindow:
             str: Path to the created report file
         """
         try:
+            generated = datetime.now()
             if log_dir:
                 # Use provided session directory
                 report_path = os.path.join(log_dir, 'duplicate_report.txt')
             else:
                 # Fallback to old behavior (shouldn't happen with new logic but good for safety)
-                logs_dir = os.path.join(os.path.dirname(__file__), 'logs')
+                logs_dir = _LOGS_BASE
                 os.makedirs(logs_dir, exist_ok=True)
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                timestamp = self._session_timestamp or generated.strftime("%Y%m%d_%H%M%S")
                 report_path = os.path.join(logs_dir, f"duplicate_report_{timestamp}.txt")
             
-            with open(report_path, 'w', encoding='utf-8') as f:
-                f.write(f"Duplicate Report - Generated {datetime.now()}\n")
+            with open(report_path, 'w', encoding='utf-8', buffering=REPORT_BUFFER_SIZE) as f:
+                f.write(f"Duplicate Report - Generated {generated}\n")
                 f.write(f"{'='*80}\n\n")
                 
-                for dup in duplicates:
-                    f.write(f"{dup['source']}  -->  {dup['existing']}\n")
+                f.writelines(f"{dup['source']}  -->  {dup['existing']}\n" for dup in duplicates)
             
             logger.info(f"Duplicate report saved to: {report_path}")
             return report_path
@@ -525,8 +648,17 @@ class MainWindow:
         Args:
             message: Message to log
         """
+        self._log_batch([message])
+    
+    def _log_batch(self, messages):
+        """
+        Add several messages to the log with a single widget update.
+        
+        Args:
+            messages: List of messages to log, one per line
+        """
         self.log_text.config(state=tk.NORMAL)
-        self.log_text.insert(tk.END, message + '\n')
+        self.log_text.insert(tk.END, '\n'.join(messages) + '\n')
         self.log_text.see(tk.END)
         self.log_text.config(state=tk.DISABLED)
 
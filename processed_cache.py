@@ -0,0 +1,116 @@
+"""
+Processed Files Cache Module
+
+Remembers which source files were already organized into a destination, so
+re-running on a half-done folder skips them without reading their metadata.
+"""
+
+import os
+import sqlite3
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Cache database kept in the destination root
+CACHE_FILENAME = '.media_tool.sqlite3'
+
+# Recorded files written per transaction
+CACHE_BATCH_SIZE = 1000
+
+
+class ProcessedCache:
+    """
+    (source path, mtime, size) -> destination path, persisted per destination.
+
+    The table is loaded into memory once, so lookups from worker threads are
+    plain dict reads. Records are buffered and written in batches by flush(),
+    which must be called from the thread that opened the cache.
+    """
+
+    def __init__(self, dest_base):
+        """
+        Open (or create) the cache in dest_base.
+
+        Args:
+            dest_base: Destination base directory
+        """
+        self._done = {}
+        self._pending = []
+        self._lock = threading.Lock()
+        self._conn = None
+
+        try:
+            os.makedirs(dest_base, exist_ok=True)
+            conn = sqlite3.connect(os.path.join(dest_base, CACHE_FILENAME))
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS done("
+                "src TEXT PRIMARY KEY, mtime INTEGER, size INTEGER, dst TEXT)"
+            )
+            for src, mtime, size, dst in conn.execute("SELECT src, mtime, size, dst FROM done"):
+                self._done[src] = (mtime, size, dst)
+            self._conn = conn
+        except (OSError, sqlite3.Error) as e:
+            # Read-only or exotic destinations just run without the cache
+            logger.warning("Processed-files cache unavailable in %s: %s", dest_base, e)
+
+    def lookup(self, source_path, source_stat):
+        """
+        Find where an unchanged source file was organized to before.
+
+        Args:
+            source_path: Source file path
+            source_stat: os.stat_result of source_path
+
+        Returns:
+            str: Destination path, or None if unknown or the source changed
+        """
+        entry = self._done.get(source_path)
+        if entry is None:
+            return None
+        mtime, size, dst = entry
+        if mtime != source_stat.st_mtime_ns or size != source_stat.st_size:
+            return None
+        return dst
+
+    def record(self, source_path, source_stat, dest_path):
+        """
+        Remember a processed file (safe to call from any thread).
+
+        Args:
+            source_path: Source file path
+            source_stat: os.stat_result of source_path
+            dest_path: Where the file was organized to
+        """
+        with self._lock:
+            self._pending.append((source_path, source_stat.st_mtime_ns, source_stat.st_size, dest_path))
+
+    def flush(self, force=False):
+        """
+        Write buffered records once a full batch is waiting (or always if force).
+
+        Args:
+            force: Write whatever is pending
+        """
+        with self._lock:
+            if not self._pending or (not force and len(self._pending) < CACHE_BATCH_SIZE):
+                return
+            batch = self._pending
+            self._pending = []
+
+        if self._conn is None:
+            return
+        try:
+            with self._conn:
+                self._conn.executemany("INSERT OR REPLACE INTO done VALUES (?, ?, ?, ?)", batch)
+        except sqlite3.Error as e:
+            logger.warning("Could not update processed-files cache: %s", e)
+
+    def close(self):
+        """Write pending records and close the database."""
+        self.flush(force=True)
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
@@ -5,55 +5,278 @@ Recursively scans directories for image and video files.
 """
 
 import os
+import sys
+import hashlib
 import logging
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from functools import lru_cache
+from utils import are_files_identical, file_hash
 
 logger = logging.getLogger(__name__)
 
+# Bytes read from each same-sized file to split a size bucket before full compares
+DUPLICATE_PREFIX_SIZE = 4096
+
+# Directories listed concurrently by scan_folder_parallel on network shares
+SCAN_WORKERS = 8
+
+# Most files per list yielded by scan_folder_batched
+SCAN_BATCH_SIZE = 1024
+
+# Directories never descended into: VCS/tool folders, OS trash and metadata,
+# NAS thumbnail caches (whose JPEG thumbnails would be imported as photos).
+# Names starting with '.' are skipped as well.
+_SKIP_DIRS = frozenset({
+    'node_modules', '@eaDir', '#recycle', '$RECYCLE.BIN',
+    'System Volume Information', '__MACOSX',
+})
+
+# Filesystem types whose directory reads are network round-trips (Linux)
+_NETWORK_FS_TYPES = frozenset({
+    'nfs', 'nfs4', 'cifs', 'smb3', 'smbfs', 'ncpfs', 'afs', '9p',
+    'ceph', 'glusterfs', 'fuse.sshfs', 'fuse.rclone',
+})
+
 # Supported image extensions
-IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.heic', '.webp', '.gif', '.bmp', '.tiff', '.tif'}
+IMAGE_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png', '.heic', '.webp', '.gif', '.bmp', '.tiff', '.tif'})
 
 # Supported video extensions
-VIDEO_EXTENSIONS = {'.mp4', '.mov', '.avi', '.mkv', '.wmv', '.flv', '.webm', '.m4v', '.3gp'}
+VIDEO_EXTENSIONS = frozenset({'.mp4', '.mov', '.avi', '.mkv', '.wmv', '.flv', '.webm', '.m4v', '.3gp'})
 
 # Combined supported extensions
 SUPPORTED_EXTENSIONS = IMAGE_EXTENSIONS | VIDEO_EXTENSIONS
 
+# Lowercased copy used for the per-file check in scan_folder
+_LOWER_EXTS = frozenset(ext.lower() for ext in SUPPORTED_EXTENSIONS)
+
+
+@lru_cache(maxsize=8)
+def _lower_extensions(extensions):
+    """Lowercased frozenset of a caller's extensions (normalized once per set)."""
+    return frozenset(ext.lower() for ext in extensions)
 
-def scan_folder(folder_path, extensions=None):
+
+def scan_folder(folder_path, extensions=None, entries=False):
     """
     Recursively scan folder for image files.
     
     Args:
         folder_path: Root folder to scan
         extensions: Set of extensions to include (default: SUPPORTED_EXTENSIONS)
+        entries: Yield os.DirEntry objects instead of paths; their stat()
+            is cached, and on Windows comes with the listing for free
         
     Yields:
-        Full path to each image file found
+        Full path (or DirEntry) of each image file found
+    """
+    for files in _scan_dirs(folder_path, extensions, entries):
+        yield from files
+
+
+def scan_folder_parallel(folder_path, extensions=None, workers=SCAN_WORKERS, entries=False):
     """
+    Recursively scan folder for media files, listing directories concurrently.
+    
+    On network shares every directory read is a round-trip, so several are
+    kept in flight. Local disks gain nothing from that and use scan_folder.
+    Each directory's files are still yielded together, but directories come
+    in completion order.
+    
+    Args:
+        folder_path: Root folder to scan
+        extensions: Set of extensions to include (default: SUPPORTED_EXTENSIONS)
+        workers: Directories listed at the same time
+        entries: Yield os.DirEntry objects instead of paths (see scan_folder)
+        
+    Yields:
+        Full path (or DirEntry) of each media file found
+    """
+    for files in _scan_dirs_auto(folder_path, extensions, workers, entries):
+        yield from files
+
+
+def scan_folder_batched(folder_path, extensions=None, batch_size=SCAN_BATCH_SIZE, workers=SCAN_WORKERS, entries=False):
+    """
+    Recursively scan folder for media files, yielding lists of files.
+    
+    Each list holds files of a single directory (large directories are
+    split), so consumers can hand whole batches to a pool. Network shares
+    are listed concurrently as in scan_folder_parallel.
+    
+    Args:
+        folder_path: Root folder to scan
+        extensions: Set of extensions to include (default: SUPPORTED_EXTENSIONS)
+        batch_size: Most files per list
+        workers: Directories listed at the same time on network shares
+        entries: Yield os.DirEntry objects instead of paths (see scan_folder)
+        
+    Yields:
+        list of full paths (or DirEntry), never empty
+    """
+    for files in _scan_dirs_auto(folder_path, extensions, workers, entries):
+        if len(files) <= batch_size:
+            yield files
+        else:
+            for i in range(0, len(files), batch_size):
+                yield files[i:i + batch_size]
+
+
+def _scan_dirs_auto(folder_path, extensions, workers, entries):
+    """_scan_dirs_parallel on network shares, _scan_dirs elsewhere."""
+    if _is_network_path(folder_path):
+        return _scan_dirs_parallel(folder_path, extensions, workers, entries)
+    return _scan_dirs(folder_path, extensions, entries)
+
+
+def _scan_dirs(folder_path, extensions, entries):
+    """
+    Walk folder_path depth-first, one directory at a time.
+    
+    Args:
+        folder_path: Root folder to scan
+        extensions: Set of extensions to include, or None for all supported
+        entries: Collect os.DirEntry objects instead of paths
+        
+    Yields:
+        list of the matching files of each directory that has any
+    """
+    # Normalize extensions to lowercase
     if extensions is None:
-        extensions = SUPPORTED_EXTENSIONS
+        extensions = _LOWER_EXTS
+    else:
+        extensions = _lower_extensions(frozenset(extensions))
+    
+    logger.info("Starting scan of: %s", folder_path)
+    count = 0
+    
+    # Depth-first like os.walk: a directory's files come together, before
+    # its subdirectories
+    pending = [folder_path]
+    while pending:
+        files, subdirs = _list_dir(pending.pop(), extensions, entries)
+        if files:
+            count += len(files)
+            yield files
+        pending.extend(reversed(subdirs))
+    
+    logger.info("Scan complete. Found %s image files.", count)
+
+
+def _scan_dirs_parallel(folder_path, extensions, workers, entries):
+    """
+    Walk folder_path listing several directories at a time.
     
+    Args:
+        folder_path: Root folder to scan
+        extensions: Set of extensions to include, or None for all supported
+        workers: Directories listed at the same time
+        entries: Collect os.DirEntry objects instead of paths
+        
+    Yields:
+        list of the matching files of each directory that has any, in
+        completion order
+    """
     # Normalize extensions to lowercase
-    extensions = {ext.lower() for ext in extensions}
+    if extensions is None:
+        extensions = _LOWER_EXTS
+    else:
+        extensions = _lower_extensions(frozenset(extensions))
     
-    logger.info(f"Starting scan of: {folder_path}")
+    logger.info("Starting parallel scan of: %s", folder_path)
     count = 0
     
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        running = {pool.submit(_list_dir, folder_path, extensions, entries)}
+        while running:
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                files, subdirs = future.result()
+                running.update(pool.submit(_list_dir, d, extensions, entries) for d in subdirs)
+                if files:
+                    count += len(files)
+                    yield files
+    
+    logger.info("Scan complete. Found %s image files.", count)
+
+
+def _list_dir(path, extensions, entries=False):
+    """
+    List one directory.
+    
+    DirEntry type checks come from the directory listing itself, so no
+    per-file stat is needed. Hidden and _SKIP_DIRS subdirectories are left out.
+    
+    Args:
+        path: Directory to list
+        extensions: Lowercased frozenset of extensions to include
+        entries: Return the matching files' os.DirEntry objects, not paths
+        
+    Returns:
+        tuple: (matching file paths or entries, subdirectory paths); both
+        empty if the directory cannot be read
+    """
+    files = []
+    subdirs = []
     try:
-        for root, dirs, files in os.walk(folder_path):
-            for filename in files:
+        with os.scandir(path) as it:
+            for entry in it:
+                name = entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    if name[0] != '.' and name not in _SKIP_DIRS:
+                        subdirs.append(entry.path)
+                    continue
                 # Check extension (case-insensitive)
-                _, ext = os.path.splitext(filename)
-                if ext.lower() in extensions:
-                    full_path = os.path.join(root, filename)
-                    count += 1
-                    yield full_path
+                dot = name.rfind('.')
+                if dot > 0 and name[dot:].lower() in extensions and not entry.is_dir():
+                    files.append(entry if entries else entry.path)
     except PermissionError as e:
-        logger.error(f"Permission denied accessing: {e}")
-    except Exception as e:
-        logger.error(f"Error scanning folder: {e}")
+        logger.error("Permission denied accessing: %s", e)
+    except OSError as e:
+        logger.error("Error scanning folder: %s", e)
+    return files, subdirs
+
+
+def _is_network_path(path):
+    """
+    Check whether path is on a network filesystem.
+    
+    Args:
+        path: File or directory path
+        
+    Returns:
+        bool: True for UNC paths, mapped network drives and NFS/SMB/... mounts
+    """
+    path = os.path.abspath(path)
+    if os.name == 'nt':
+        if path.startswith(('\\\\', '//')):
+            return True
+        try:
+            import ctypes
+            DRIVE_REMOTE = 4
+            return ctypes.windll.kernel32.GetDriveTypeW(os.path.splitdrive(path)[0] + '\\') == DRIVE_REMOTE
+        except (OSError, AttributeError):
+            return False
+    
+    if sys.platform.startswith('linux'):
+        # The longest mount point containing path decides its filesystem type
+        path = os.path.realpath(path)
+        best, fs_type = '', None
+        try:
+            with open('/proc/self/mounts', encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    fields = line.split()
+                    if len(fields) < 3:
+                        continue
+                    mount_point = fields[1].replace('\\040', ' ')
+                    if (path == mount_point or path.startswith(mount_point.rstrip('/') + '/')) \
+                            and len(mount_point) > len(best):
+                        best, fs_type = mount_point, fields[2]
+        except OSError:
+            return False
+        return fs_type in _NETWORK_FS_TYPES
     
-    logger.info(f"Scan complete. Found {count} image files.")
+    return False
 
 
 def count_images(folder_path, extensions=None):
@@ -68,3 +291,98 @@ def count_images(folder_path, extensions=None):
         Total count of image files
     """
     return sum(1 for _ in scan_folder(folder_path, extensions))
+
+
+def _prefix_digest(path):
+    """
+    Digest of the first DUPLICATE_PREFIX_SIZE bytes of a file.
+    
+    Args:
+        path: Path to file
+        
+    Returns:
+        bytes: Digest, or None if the file cannot be read
+    """
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.blake2b(f.read(DUPLICATE_PREFIX_SIZE), digest_size=16).digest()
+    except OSError as e:
+        logger.warning("Cannot read %s: %s", path, e)
+        return None
+
+
+def find_duplicate_groups(paths, max_workers=4):
+    """
+    Group files with identical content.
+    
+    Files are bucketed by size, then by a digest of their first few KiB.
+    Buckets of three or more are split again by a full-content digest, so
+    files that only differ late are not compared pairwise. The survivors
+    are compared in full, each against its bucket's representative with
+    early exit on the first differing chunk.
+    
+    Args:
+        paths: Iterable of file paths
+        max_workers: Threads used for the full comparisons
+        
+    Returns:
+        list: Lists of paths with identical content (each at least two long)
+    """
+    by_size = defaultdict(list)
+    for path in paths:
+        try:
+            by_size[os.stat(path).st_size].append(path)
+        except OSError as e:
+            logger.warning("Cannot stat %s: %s", path, e)
+    
+    buckets = []
+    for same_size in by_size.values():
+        if len(same_size) < 2:
+            continue
+        by_prefix = defaultdict(list)
+        for path in same_size:
+            digest = _prefix_digest(path)
+            if digest is not None:
+                by_prefix[digest].append(path)
+        buckets.extend(bucket for bucket in by_prefix.values() if len(bucket) > 1)
+    
+    groups = []
+    if not buckets:
+        return groups
+    
+    executor = None
+    try:
+        # A pair is settled by one comparison; hashing only pays off for
+        # buckets of three or more, which would otherwise be compared pairwise
+        large = [bucket for bucket in buckets if len(bucket) > 2]
+        if large:
+            buckets = [bucket for bucket in buckets if len(bucket) == 2]
+            executor = ThreadPoolExecutor(max_workers=max_workers)
+            for bucket in large:
+                by_digest = defaultdict(list)
+                for path, digest in zip(bucket, executor.map(file_hash, bucket)):
+                    if digest is not None:
+                        by_digest[digest].append(path)
+                buckets.extend(same for same in by_digest.values() if len(same) > 1)
+        
+        for remaining in buckets:
+            while len(remaining) > 1:
+                first, others = remaining[0], remaining[1:]
+                if len(others) == 1:
+                    # A single pair is not worth a round trip through the pool
+                    matches = [are_files_identical(first, others[0])]
+                else:
+                    if executor is None:
+                        executor = ThreadPoolExecutor(max_workers=max_workers)
+                    matches = list(executor.map(lambda path: are_files_identical(first, path), others))
+                
+                group = [first] + [path for path, same in zip(others, matches) if same]
+                if len(group) > 1:
+                    groups.append(group)
+                # Files that differed from this representative may still match each other
+                remaining = [path for path, same in zip(others, matches) if not same]
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    
+    return groups
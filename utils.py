@@ -2,18 +2,68 @@
 Shared Utilities Module
 """
 
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
+import hashlib
+import threading
+from contextlib import contextmanager
 from datetime import datetime
+from functools import lru_cache
+
+# Log records buffered before the log file is written (errors flush immediately)
+LOG_BUFFER_RECORDS = 1024
+
+# Default size of the pooled read buffers
+READ_BUFFER_SIZE = 1024 * 1024
+
+# Idle buffers kept per size; more concurrent borrowers just allocate. A pool
+# never outgrows the peak number of concurrent borrowers and is emptied by
+# clear_buffer_pools at the end of a run
+MAX_POOLED_BUFFERS = 64
+
+# Units of format_file_size, one per power of 1024
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+# QueueListener started by setup_logging (None until logging is set up)
+_log_listener = None
+
+# size -> idle bytearrays, reused last-in first-out so recent ones stay warm
+_buffer_pools = {}
+_buffer_lock = threading.Lock()
+
+# Content digests keyed by (path, size, mtime_ns); an edited file gets a new key
+_hash_cache = {}
+_hash_lock = threading.Lock()
+
+
+def clear_hash_cache():
+    """Forget all digests computed by file_hash (call between runs)."""
+    with _hash_lock:
+        _hash_cache.clear()
+
+
+def clear_buffer_pools():
+    """Drop the idle buffers kept by borrowed_buffer (call when a run ends)."""
+    with _buffer_lock:
+        _buffer_pools.clear()
 
 
 def setup_logging(log_file='image_tool.log'):
     """
     Configure logging to file and console.
     
+    Only the first call configures anything; later calls return at once.
+    
     Args:
         log_file: Base name for log file (timestamp will be added)
     """
+    global _log_listener
+    if _log_listener is not None:
+        return
+    
     # Create logs directory if it doesn't exist
     logs_dir = 'logs'
     os.makedirs(logs_dir, exist_ok=True)
@@ -23,15 +73,34 @@ def setup_logging(log_file='image_tool.log'):
     log_filename = f"image_tool_{timestamp}.log"
     log_path = os.path.join(logs_dir, log_filename)
     
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_path, encoding='utf-8'),
-            logging.StreamHandler()
-        ]
+    log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    formatter = logging.Formatter(log_format)
+    
+    # Batch file writes instead of one write per record; logging's exit hook
+    # flushes whatever is still buffered. The file is opened on the first write.
+    log_file_handler = logging.FileHandler(log_path, encoding='utf-8', delay=True)
+    log_file_handler.setFormatter(formatter)
+    file_handler = logging.handlers.MemoryHandler(
+        LOG_BUFFER_RECORDS,
+        flushLevel=logging.ERROR,
+        target=log_file_handler
     )
-
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(formatter)
+    
+    # Logging threads only enqueue records; one listener thread formats and
+    # writes them, so workers never wait on the file or console handler locks
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, file_handler, console_handler)
+    listener.start()
+    _log_listener = listener
+    # Registered after logging's own exit hook, so it runs first and hands
+    # the last records to the handlers before they are flushed and closed
+    atexit.register(listener.stop)
+    
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
 
 
 def is_image_file(filename, extensions):
@@ -45,8 +114,8 @@ def is_image_file(filename, extensions):
     Returns:
         bool
     """
-    _, ext = os.path.splitext(filename)
-    return ext.lower() in extensions
+    dot = filename.rfind('.')
+    return dot >= 0 and filename[dot:].lower() in extensions
 
 
 def format_file_size(size_bytes):
@@ -54,48 +123,175 @@ def format_file_size(size_bytes):
     Format file size in human-readable format.
     
     Args:
-        size_bytes: Size in bytes
+        size_bytes: Size in bytes (int)
         
     Returns:
         Formatted string (e.g., "1.5 MB")
     """
-    for unit in ['B', 'KB', 'MB', 'GB']:
-        if size_bytes < 1024.0:
-            return f"{size_bytes:.1f} {unit}"
-        size_bytes /= 1024.0
-    return f"{size_bytes:.1f} TB"
+    if size_bytes < 1024:
+        return f"{size_bytes:.1f} B"
+    # Every 10 bits is one unit step (capped at TB)
+    unit = (size_bytes.bit_length() - 1) // 10
+    if unit > 4:
+        unit = 4
+    return f"{size_bytes / (1 << (10 * unit)):.1f} {_SIZE_UNITS[unit]}"
+
+
+@contextmanager
+def borrowed_buffer(size=READ_BUFFER_SIZE):
+    """
+    Borrow a reusable bytearray for readinto() loops.
+    
+    Avoids allocating (and page-faulting in) a fresh large buffer on every
+    comparison or copy when many workers run them concurrently.
+    
+    Args:
+        size: Buffer size in bytes
+        
+    Yields:
+        bytearray of the requested size (contents undefined)
+    """
+    with _buffer_lock:
+        pool = _buffer_pools.get(size)
+        buf = pool.pop() if pool else None
+    if buf is None:
+        buf = bytearray(size)
+    try:
+        yield buf
+    finally:
+        with _buffer_lock:
+            pool = _buffer_pools.setdefault(size, [])
+            if len(pool) < MAX_POOLED_BUFFERS:
+                pool.append(buf)
 
 
-def are_files_identical(path1, path2, chunk_size=4096):
+def are_files_identical(path1, path2, chunk_size=READ_BUFFER_SIZE, prefix_size=64 * 1024):
     """
     Check if two files are bit-for-bit identical.
     
+    Staged so different files cost as little as possible: sizes first (no
+    reads), then a short prefix (different photos almost always differ in
+    their headers), then reads that double in size up to chunk_size, so an
+    early mismatch is found after little I/O and long equal runs are read in
+    large blocks.
+    
     Args:
         path1: Path to first file
         path2: Path to second file
-        chunk_size: Size of chunks to read/compare
+        chunk_size: Largest read/compare block after the prefix
+        prefix_size: Size of the first block compared
         
     Returns:
         bool: True if identical, False otherwise
     """
     try:
         # Check size first (fastest)
-        if os.path.getsize(path1) != os.path.getsize(path2):
+        stat1 = os.stat(path1)
+        stat2 = os.stat(path2)
+        if stat1.st_size != stat2.st_size:
             return False
-            
-        # Compare binary content
-        with open(path1, 'rb') as f1, open(path2, 'rb') as f2:
-            while True:
-                chunk1 = f1.read(chunk_size)
-                chunk2 = f2.read(chunk_size)
-                
-                if chunk1 != chunk2:
-                    return False
-                    
-                if not chunk1:  # EOF
-                    return True
+        
+        # Hard links to one file (st_ino is 0 where the filesystem has none)
+        if stat1.st_ino and stat1.st_dev == stat2.st_dev and stat1.st_ino == stat2.st_ino:
+            return True
+        
+        # Different digests from earlier file_hash calls settle it unread
+        with _hash_lock:
+            digest1 = _hash_cache.get((path1, stat1.st_size, stat1.st_mtime_ns))
+            digest2 = _hash_cache.get((path2, stat2.st_size, stat2.st_mtime_ns))
+        if digest1 is not None and digest2 is not None and digest1 != digest2:
+            return False
+        
+        # Results are cached per file version; order the pair so (a, b) and
+        # (b, a) share an entry
+        key1 = (stat1.st_dev, stat1.st_ino, stat1.st_mtime_ns)
+        key2 = (stat2.st_dev, stat2.st_ino, stat2.st_mtime_ns)
+        if key2 < key1:
+            path1, path2, key1, key2 = path2, path1, key2, key1
+        return _contents_equal(path1, path2, key1, key2, chunk_size, prefix_size)
                     
     except OSError as e:
         # If any file access error (e.g. missing, locked), assume different to be safe
-        logging.getLogger(__name__).warning(f"Error comparing files: {e}")
+        logging.getLogger(__name__).warning("Error comparing files: %s", e)
         return False
+
+
+@lru_cache(maxsize=4096)
+def _contents_equal(path1, path2, key1, key2, chunk_size, prefix_size):
+    """
+    Compare the bytes of two same-sized files (body of are_files_identical).
+    
+    key1/key2 are (st_dev, st_ino, st_mtime_ns) and only serve as cache keys,
+    so an edited file is compared again. Read errors propagate as OSError
+    and are therefore never cached.
+    
+    Returns:
+        bool: True if identical
+    """
+    # Compare binary content
+    with open(path1, 'rb') as f1, open(path2, 'rb') as f2:
+        if f1.read(prefix_size) != f2.read(prefix_size):
+            return False
+        
+        with borrowed_buffer(chunk_size) as buf1, borrowed_buffer(chunk_size) as buf2, \
+                memoryview(buf1) as view1, memoryview(buf2) as view2:
+            step = min(prefix_size * 2, chunk_size)
+            while True:
+                n1 = f1.readinto(view1[:step])
+                n2 = f2.readinto(view2[:step])
+                
+                if n1 != n2:
+                    return False
+                
+                if n1 < chunk_size:
+                    # Ramping up, or EOF: compare just what was read
+                    if buf1[:n1] != buf2[:n2]:
+                        return False
+                    if n1 < step:
+                        return True
+                # Whole-bytearray equality is a memcmp (a memoryview compare is not)
+                elif buf1 != buf2:
+                    return False
+                
+                step = min(step * 2, chunk_size)
+
+
+def file_hash(path, stat_result=None, chunk_size=READ_BUFFER_SIZE):
+    """
+    Compute a BLAKE2b content digest of a file, cached per (path, size, mtime).
+    
+    Args:
+        path: Path to file
+        stat_result: Optional os.stat_result of path (avoids a second stat)
+        chunk_size: Size of chunks to read (Python < 3.11)
+        
+    Returns:
+        bytes digest, or None if the file could not be read
+    """
+    try:
+        if stat_result is None:
+            stat_result = os.stat(path)
+        key = (path, stat_result.st_size, stat_result.st_mtime_ns)
+        with _hash_lock:
+            digest = _hash_cache.get(key)
+        if digest is not None:
+            return digest
+        
+        with open(path, 'rb', buffering=0) as f:
+            if hasattr(hashlib, 'file_digest'):
+                # Python 3.11+: the read loop runs in C
+                h = hashlib.file_digest(f, lambda: hashlib.blake2b(digest_size=16))
+            else:
+                h = hashlib.blake2b(digest_size=16)
+                with borrowed_buffer(chunk_size) as buf, memoryview(buf) as view:
+                    while n := f.readinto(view):
+                        h.update(view[:n])
+        digest = h.digest()
+        
+        with _hash_lock:
+            _hash_cache[key] = digest
+        return digest
+        
+    except OSError as e:
+        logging.getLogger(__name__).warning("Error hashing file: %s", e)
+        return None
@@ -7,13 +7,43 @@ Extracts date information from video files with fallback logic:
 """
 
 import os
+import struct
+import shutil
 import logging
 import subprocess
-import json
-from datetime import datetime
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+import _exif_cache
 
 logger = logging.getLogger(__name__)
 
+# ffprobe resolved on PATH once, so each spawn skips the search
+_FFPROBE = shutil.which('ffprobe') or 'ffprobe'
+
+# Keep ffprobe from opening a console window (Windows)
+_CREATIONFLAGS = subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+
+# ISO base media containers whose mvhd creation time is read directly
+_MP4_EXTS = frozenset({'.mp4', '.mov', '.m4v', '.3gp'})
+
+# Epoch of MP4/QuickTime timestamps (seconds since 1904-01-01 UTC)
+_MP4_EPOCH = datetime(1904, 1, 1)
+
+# Common datetime formats in video metadata
+_VIDEO_DATE_FORMATS = (
+    "%Y-%m-%dT%H:%M:%S.%fZ",      # ISO 8601 with microseconds
+    "%Y-%m-%dT%H:%M:%SZ",          # ISO 8601 without microseconds
+    "%Y-%m-%dT%H:%M:%S.%f%z",      # ISO 8601 with timezone
+    "%Y-%m-%dT%H:%M:%S%z",         # ISO 8601 with timezone, no microseconds
+    "%Y-%m-%d %H:%M:%S",           # Simple format
+    "%Y:%m:%d %H:%M:%S",           # EXIF-like format
+    "%Y-%m-%d",                    # Date only
+)
+
+# Format of the last successfully parsed date (tried first)
+_last_format = None
+
 
 def validate_video(file_path):
     """
@@ -25,72 +55,231 @@ def validate_video(file_path):
     Returns:
         tuple: (is_valid: bool, error_message: str or None)
     """
+    data, error_msg = _ffprobe(file_path)
+    if data is None:
+        return (False, error_msg)
+    return _check_video_streams(data, file_path)
+
+
+def probe_video(file_path, stat_result=None):
+    """
+    Validate a video and extract its date from a single ffprobe run.
+    
+    Equivalent to validate_video followed by get_video_date, with one
+    process spawn instead of two. MP4/MOV files whose movie header lists a
+    video track and whose media data ends within the file need no ffprobe
+    at all. That check trusts the box structure: unlike ffprobe it does not
+    parse the codec setup of the track, so a file damaged inside its sample
+    tables is accepted here and only fails when played.
+    
+    Args:
+        file_path: Path to video file
+        stat_result: Optional os.stat_result of file_path (avoids a second stat)
+        
+    Returns:
+        tuple: (is_valid: bool, date: datetime or None, error_message: str or None)
+    """
+    if stat_result is None:
+        try:
+            stat_result = os.stat(file_path)
+        except OSError:
+            pass
+    
+    # Unchanged file that was valid before: no need to probe it again
+    if stat_result is not None:
+        found, metadata_date = _exif_cache.lookup(file_path, stat_result)
+        if found:
+            return (True, metadata_date or _get_file_modified_date(file_path, stat_result), None)
+    
+    # MP4/MOV with a readable movie header, a video track and complete media
+    # data; anything else (truncated copies included) goes to ffprobe
+    header = None
+    if os.path.splitext(file_path)[1].lower() in _MP4_EXTS:
+        header = _mp4_probe(file_path)
+    if header is not None and header[0]:
+        metadata_date = header[1]
+    else:
+        data, error_msg = _ffprobe(file_path, stat_result)
+        if data is None:
+            return (False, None, error_msg)
+        
+        is_valid, error_msg = _check_video_streams(data, file_path)
+        if not is_valid:
+            return (False, None, error_msg)
+        
+        metadata_date = _creation_time(data, file_path)
+    
+    # Only validated files are cached, so a hit also means "valid"
+    if stat_result is not None:
+        _exif_cache.store(file_path, stat_result, metadata_date)
+    
+    if metadata_date:
+        return (True, metadata_date, None)
+    return (True, _get_file_modified_date(file_path, stat_result), None)
+
+
+def get_video_date(file_path, stat_result=None):
+    """
+    Extract date from video file.
+    
+    Args:
+        file_path: Path to video file
+        stat_result: Optional os.stat_result of file_path (avoids a second stat)
+        
+    Returns:
+        datetime object or None if all methods fail
+    """
+    # Dates of unchanged files come from the on-disk cache
+    found = False
+    if stat_result is None:
+        try:
+            stat_result = os.stat(file_path)
+        except OSError:
+            pass
+    if stat_result is not None:
+        found, metadata_date = _exif_cache.lookup(file_path, stat_result)
+    
+    # Try video metadata first
+    if not found:
+        metadata_date = _get_video_metadata_date(file_path, stat_result)
+    if metadata_date:
+        return metadata_date
+    
+    # Fallback to file modified time
+    return _get_file_modified_date(file_path, stat_result)
+
+
+def _ffprobe(file_path, stat_result=None):
+    """
+    Get the ffprobe output of a video, probing each file version once.
+    
+    validate_video and get_video_date called one after the other share
+    a single ffprobe run.
+    
+    Args:
+        file_path: Path to video file
+        stat_result: Optional os.stat_result of file_path (avoids a second stat)
+        
+    Returns:
+        tuple: (data: dict or None, error_message: str or None)
+    """
+    if stat_result is None:
+        try:
+            stat_result = os.stat(file_path)
+        except OSError:
+            return _run_ffprobe(file_path)
+    try:
+        return (_cached_ffprobe(file_path, stat_result.st_mtime_ns, stat_result.st_size), None)
+    except _ProbeFailed as e:
+        return (None, e.error_msg)
+
+
+class _ProbeFailed(Exception):
+    """Raised by _cached_ffprobe so that failed probes are not memoized."""
+    
+    def __init__(self, error_msg):
+        super().__init__(error_msg)
+        self.error_msg = error_msg
+
+
+@lru_cache(maxsize=1024)
+def _cached_ffprobe(file_path, mtime_ns, size):
+    """
+    _run_ffprobe memoized per (path, mtime_ns, size).
+    
+    Only successful probes are cached: a missing ffprobe or a transient
+    failure raises _ProbeFailed, which lru_cache does not store.
+    """
+    data, error_msg = _run_ffprobe(file_path)
+    if data is None:
+        raise _ProbeFailed(error_msg)
+    return data
+
+
+def _run_ffprobe(file_path):
+    """
+    Run ffprobe once for everything validate_video and get_video_date need:
+    the first video stream and the creation_time tag.
+    
+    Args:
+        file_path: Path to video file
+        
+    Returns:
+        tuple: (data: dict or None, error_message: str or None)
+    """
     try:
-        # Use ffprobe to check if file is valid video
         result = subprocess.run(
             [
-                'ffprobe',
+                _FFPROBE,
                 '-v', 'error',
                 '-select_streams', 'v:0',
-                '-show_entries', 'stream=codec_type',
-                '-of', 'json',
+                '-show_entries', 'stream=codec_type:format_tags=creation_time',
+                # Flat "key=value" lines, e.g. codec_type=video
+                '-of', 'default=nw=1',
                 file_path
             ],
             capture_output=True,
             text=True,
-            creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+            creationflags=_CREATIONFLAGS
         )
         
         if result.returncode != 0:
             error_msg = f"Invalid video file: {result.stderr.strip()}"
-            logger.warning(f"{error_msg} - {file_path}")
-            return (False, error_msg)
+            logger.warning("%s - %s", error_msg, file_path)
+            return (None, error_msg)
         
-        # Parse output
-        data = json.loads(result.stdout)
-        streams = data.get('streams', [])
-        
-        if not streams:
-            error_msg = "No video stream found in file"
-            logger.warning(f"{error_msg} - {file_path}")
-            return (False, error_msg)
-        
-        return (True, None)
+        # Tags come as "TAG:creation_time=..."
+        return (dict(line.split('=', 1) for line in result.stdout.splitlines() if '=' in line), None)
         
     except FileNotFoundError:
         error_msg = "FFmpeg/ffprobe not installed or not in PATH"
         logger.error(error_msg)
-        return (False, error_msg)
-    except json.JSONDecodeError as e:
-        error_msg = f"Error parsing video metadata: {e}"
-        logger.warning(f"{error_msg} - {file_path}")
-        return (False, error_msg)
+        return (None, error_msg)
     except Exception as e:
         error_msg = f"Error validating video: {str(e)}"
-        logger.warning(f"{error_msg} - {file_path}")
+        logger.warning("%s - %s", error_msg, file_path)
+        return (None, error_msg)
+
+
+def _check_video_streams(data, file_path):
+    """
+    Check that ffprobe found a video stream.
+    
+    Args:
+        data: Parsed ffprobe output
+        file_path: Path to video file (for logging)
+        
+    Returns:
+        tuple: (is_valid: bool, error_message: str or None)
+    """
+    if 'codec_type' not in data:
+        error_msg = "No video stream found in file"
+        logger.warning("%s - %s", error_msg, file_path)
         return (False, error_msg)
+    return (True, None)
 
 
-def get_video_date(file_path):
+def _creation_time(data, file_path):
     """
-    Extract date from video file.
+    Get the creation_time format tag from parsed ffprobe output.
     
     Args:
-        file_path: Path to video file
+        data: Parsed ffprobe output
+        file_path: Path to video file (for logging)
         
     Returns:
-        datetime object or None if all methods fail
+        datetime object or None
     """
-    # Try video metadata first
-    metadata_date = _get_video_metadata_date(file_path)
-    if metadata_date:
-        return metadata_date
+    # Try creation_time
+    creation_time = data.get('TAG:creation_time')
+    if creation_time:
+        return _parse_video_datetime(creation_time)
     
-    # Fallback to file modified time
-    return _get_file_modified_date(file_path)
+    logger.debug("No creation_time in metadata: %s", file_path)
+    return None
 
 
-def _get_video_metadata_date(file_path):
+def _get_video_metadata_date(file_path, stat_result=None):
     """
     Extract date from video metadata using ffprobe.
     
@@ -99,47 +288,204 @@ def _get_video_metadata_date(file_path):
     
     Args:
         file_path: Path to video file
+        stat_result: Optional os.stat_result of file_path (avoids a second stat)
         
     Returns:
         datetime object or None
     """
-    try:
-        result = subprocess.run(
-            [
-                'ffprobe',
-                '-v', 'quiet',
-                '-show_entries', 'format_tags=creation_time',
-                '-of', 'json',
-                file_path
-            ],
-            capture_output=True,
-            text=True,
-            creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
-        )
+    # MP4/MOV: the creation time sits in the moov header, no ffprobe needed
+    if os.path.splitext(file_path)[1].lower() in _MP4_EXTS:
+        creation_time = _mp4_creation_time(file_path)
+        if creation_time:
+            return creation_time
+    
+    data, _ = _ffprobe(file_path, stat_result)
+    if data is None:
+        return None
+    return _creation_time(data, file_path)
+
+
+def _mp4_creation_time(file_path):
+    """
+    Read the creation time from the moov/mvhd box of an MP4/MOV file.
+    
+    Args:
+        file_path: Path to MP4/MOV file
         
-        if result.returncode != 0:
-            logger.debug(f"ffprobe failed for: {file_path}")
-            return None
+    Returns:
+        datetime object or None if the box is missing, unset or unreadable
+    """
+    header = _mp4_probe(file_path)
+    return header[1] if header is not None else None
+
+
+def _mp4_probe(file_path):
+    """
+    Read the movie header of an MP4/MOV file without ffprobe.
+    
+    The creation time is the mvhd value ffprobe reports as creation_time,
+    in UTC like the ffprobe result. A track with a 'vide' handler is what
+    ffprobe's first video stream comes from; the file only counts as
+    complete if it has an mdat box and no top-level box runs past its end.
+    
+    Args:
+        file_path: Path to MP4/MOV file
         
-        data = json.loads(result.stdout)
-        tags = data.get('format', {}).get('tags', {})
+    Returns:
+        tuple: (has_video_track: bool, creation_time: datetime or None), or
+        None if there is no readable moov/mvhd; has_video_track is also
+        False for incomplete files
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            file_size = os.fstat(f.fileno()).st_size
+            moov = _find_mp4_box(f, 0, file_size, b'moov')
+            if moov is None:
+                return None
+            
+            mvhd = None
+            has_video = False
+            for box_type, payload, box_end in _iter_mp4_boxes(f, moov[0], moov[1]):
+                if box_type == b'mvhd':
+                    mvhd = payload
+                elif box_type == b'trak' and not has_video:
+                    has_video = _is_video_trak(f, payload, box_end)
+            if mvhd is None:
+                return None
+            
+            f.seek(mvhd)
+            header = f.read(12)
+            if len(header) < 8:
+                return None
+            # Full box: version(1) flags(3), then 32- or 64-bit creation time
+            if header[0] == 1:
+                if len(header) < 12:
+                    return None
+                seconds = struct.unpack('>Q', header[4:12])[0]
+            else:
+                seconds = struct.unpack('>I', header[4:8])[0]
         
-        # Try creation_time
-        creation_time = tags.get('creation_time') or tags.get('Creation Time')
-        if creation_time:
-            return _parse_video_datetime(creation_time)
+            if has_video:
+                has_video = _mp4_media_complete(f, file_size)
         
-        logger.debug(f"No creation_time in metadata: {file_path}")
-        return None
+        return (has_video, _MP4_EPOCH + timedelta(seconds=seconds) if seconds else None)
         
-    except FileNotFoundError:
-        logger.error("FFmpeg/ffprobe not found")
-        return None
-    except Exception as e:
-        logger.warning(f"Error reading video metadata from {file_path}: {e}")
+    except (OSError, OverflowError) as e:
+        logger.debug("Could not read movie header from %s: %s", file_path, e)
         return None
 
 
+def _mp4_media_complete(f, file_size):
+    """
+    Check that an MP4 file has media data and was not cut short.
+    
+    Args:
+        f: Binary file object
+        file_size: Size of the file in bytes
+        
+    Returns:
+        bool: True if there is an mdat box and every top-level box ends
+        within the file
+    """
+    pos = 0
+    has_mdat = False
+    while pos + 8 <= file_size:
+        f.seek(pos)
+        size, box_type = struct.unpack('>I4s', f.read(8))
+        if size == 1:
+            large = f.read(8)
+            if len(large) < 8:
+                return False
+            size = struct.unpack('>Q', large)[0]
+        elif size == 0:
+            # Last box, extends to the end of the file
+            size = file_size - pos
+        if size < 8 or pos + size > file_size:
+            return False
+        has_mdat = has_mdat or box_type == b'mdat'
+        pos += size
+    return has_mdat
+
+
+def _is_video_trak(f, start, end):
+    """
+    Check whether a trak box holds a video track (mdia/hdlr handler 'vide').
+    
+    Args:
+        f: Binary file object
+        start: Payload start of the trak box
+        end: End of the trak box
+        
+    Returns:
+        bool: True for a video track
+    """
+    mdia = _find_mp4_box(f, start, end, b'mdia')
+    if mdia is None:
+        return False
+    hdlr = _find_mp4_box(f, mdia[0], mdia[1], b'hdlr')
+    if hdlr is None:
+        return False
+    # version/flags(4), pre_defined(4), handler_type(4)
+    f.seek(hdlr[0] + 8)
+    return f.read(4) == b'vide'
+
+
+def _find_mp4_box(f, start, end, box_type):
+    """
+    Find a box among the siblings in [start, end) of an MP4 file.
+    
+    Args:
+        f: Binary file object
+        start: Offset of the first sibling box
+        end: Offset where the siblings end
+        box_type: 4-byte box type to look for
+        
+    Returns:
+        tuple: (payload start, box end) offsets, or None if not found
+    """
+    for found_type, payload, box_end in _iter_mp4_boxes(f, start, end):
+        if found_type == box_type:
+            return (payload, box_end)
+    return None
+
+
+def _iter_mp4_boxes(f, start, end):
+    """
+    Walk the sibling boxes in [start, end) of an MP4 file.
+    
+    Args:
+        f: Binary file object
+        start: Offset of the first sibling box
+        end: Offset where the siblings end
+        
+    Yields:
+        tuple: (box type, payload start, box end); stops at a malformed box
+    """
+    pos = start
+    while pos + 8 <= end:
+        f.seek(pos)
+        header = f.read(8)
+        if len(header) < 8:
+            return
+        size, box_type = struct.unpack('>I4s', header)
+        payload = pos + 8
+        if size == 1:
+            # 64-bit size follows the type
+            large = f.read(8)
+            if len(large) < 8:
+                return
+            size = struct.unpack('>Q', large)[0]
+            payload += 8
+        elif size == 0:
+            # Box extends to the end of its parent
+            size = end - pos
+        if size < payload - pos:
+            return
+        
+        yield (box_type, payload, min(pos + size, end))
+        pos += size
+
+
 def _parse_video_datetime(date_str):
     """
     Parse video datetime string.
@@ -154,49 +500,55 @@ def _parse_video_datetime(date_str):
     Returns:
         datetime object or None
     """
-    # Common datetime formats in video metadata
-    formats = [
-        "%Y-%m-%dT%H:%M:%S.%fZ",      # ISO 8601 with microseconds
-        "%Y-%m-%dT%H:%M:%SZ",          # ISO 8601 without microseconds
-        "%Y-%m-%dT%H:%M:%S.%f%z",      # ISO 8601 with timezone
-        "%Y-%m-%dT%H:%M:%S%z",         # ISO 8601 with timezone, no microseconds
-        "%Y-%m-%d %H:%M:%S",           # Simple format
-        "%Y:%m:%d %H:%M:%S",           # EXIF-like format
-        "%Y-%m-%d",                    # Date only
-    ]
-    
-    for fmt in formats:
+    global _last_format
+    date_str = date_str.strip()
+    
+    # One camera usually records a whole library, so its format goes first.
+    # %z also accepts 'Z', where the list order prefers the naive Z formats.
+    if _last_format is not None and not (date_str.endswith('Z') and _last_format.endswith('%z')):
+        try:
+            return datetime.strptime(date_str, _last_format)
+        except ValueError:
+            pass
+    
+    for fmt in _VIDEO_DATE_FORMATS:
+        if fmt is _last_format:
+            continue
         try:
-            return datetime.strptime(date_str.strip(), fmt)
+            date = datetime.strptime(date_str, fmt)
         except ValueError:
             continue
+        _last_format = fmt
+        return date
     
     # Try parsing with fromisoformat (Python 3.7+)
     try:
         # Handle 'Z' suffix
         if date_str.endswith('Z'):
             date_str = date_str[:-1] + '+00:00'
-        return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+        return datetime.fromisoformat(date_str)
     except ValueError:
         pass
     
-    logger.warning(f"Could not parse video date: {date_str}")
+    logger.warning("Could not parse video date: %s", date_str)
     return None
 
 
-def _get_file_modified_date(file_path):
+def _get_file_modified_date(file_path, stat_result=None):
     """
     Get file modified time as fallback.
     
     Args:
         file_path: Path to file
+        stat_result: Optional os.stat_result of file_path (avoids a second stat)
         
     Returns:
         datetime object or None
     """
     try:
-        mtime = os.path.getmtime(file_path)
-        return datetime.fromtimestamp(mtime)
+        if stat_result is None:
+            stat_result = os.stat(file_path)
+        return datetime.fromtimestamp(stat_result.st_mtime)
     except Exception as e:
-        logger.error(f"Could not get modified time for {file_path}: {e}")
+        logger.error("Could not get modified time for %s: %s", file_path, e)
         return None